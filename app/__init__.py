@@ -1,6 +1,5 @@
 import os
 from flask import Flask
-from flask_wtf import CSRFProtect
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -8,19 +7,27 @@ from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
 from .config import DevelopmentConfig, ProductionConfig
-from .utils import init_template_filters
+from .metrics import init_metrics, record_rate_limited
+from .utils import (
+    MaskedCSRFProtect,
+    init_assets,
+    init_compression,
+    init_partials,
+    init_template_filters,
+)
 
 login_manager = LoginManager()
 login_manager.login_view = "main.login"
 
 db = SQLAlchemy()
-csrf = CSRFProtect()
+csrf = MaskedCSRFProtect()
 
 
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["20 per minute"],
     storage_uri="memory://",
+    on_breach=record_rate_limited,
 )
 
 
@@ -42,14 +49,47 @@ def create_app(config_class=None):
     if not app.config["SECRET_KEY"]:
         raise ValueError("SECRET_KEY is not set.")
 
+    init_metrics(app)
     db.init_app(app)
     login_manager.init_app(app)
     csrf.init_app(app)
     limiter.init_app(app)
 
     init_template_filters(app)
+    init_compression(app)
+    init_assets(app)
+    init_partials(app)
+
+    from app.tracing import init_tracing
+    init_tracing(app)
+
+    from app.warmup import init_template_cache, timed
+    init_template_cache(app)
+
+    # Reported by the worker warm-up (see gunicorn.conf.py)
+    startup = app.extensions["startup_timings"] = {}
+    with timed(startup, "import views"):
+        # Registers the user loader
+        from app import identity  # noqa: F401
+        from app.routes import bp as main_bp
+        from app.api import bp as api_bp
 
-    from app.routes import bp as main_bp
     app.register_blueprint(main_bp)
 
+    # Token-authenticated, so no CSRF tokens
+    csrf.exempt(api_bp)
+    app.register_blueprint(api_bp)
+
+    from app.commands import register_commands
+    register_commands(app)
+
+    from app.idempotency import init_idempotency
+    init_idempotency(app)
+
+    from app.profiling import init_profiling
+    init_profiling(app)
+
+    from app.health import init_health
+    init_health(app)
+
     return app
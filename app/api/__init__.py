@@ -0,0 +1,29 @@
+"""
+Versioned JSON API for internal tools, authenticated with bearer tokens
+(`flask create-api-token`). List endpoints select plain columns and page
+with keyset cursors; POST and PATCH take {"items": [...]} in bulk.
+
+All endpoints share one quota per token, API_RATE_LIMIT (600 requests a
+minute), instead of the site's per-address limits; past it they answer
+429.
+"""
+from flask import Blueprint, jsonify
+from werkzeug.exceptions import HTTPException
+
+from app import limiter
+from app.constants import API_RATE_LIMIT
+from .auth import rate_limit_key
+
+bp = Blueprint("api_v1", __name__, url_prefix="/api/v1")
+limiter.shared_limit(API_RATE_LIMIT, scope="api_v1", key_func=rate_limit_key)(bp)
+
+
+@bp.errorhandler(HTTPException)
+def _json_error(e):
+    # abort(response) already carries a JSON body
+    if e.response is not None:
+        return e.response
+    return jsonify(error=e.description), e.code
+
+
+from . import clients, sessions, exercises, tags  # noqa: F401,E402
@@ -0,0 +1,45 @@
+import hashlib
+import secrets
+from functools import wraps
+
+from flask import abort, g, request
+from sqlalchemy import select
+
+from app import db
+from app.models import ApiToken
+
+
+def new_token() -> str:
+    """A random token; show it once and store only hash_token() of it."""
+    return secrets.token_urlsafe(32)
+
+
+def hash_token(token: str) -> str:
+    # Tokens are random, so a fast unsalted digest is enough
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def rate_limit_key() -> str:
+    """Limiter key: the bearer token's hash, or the address without one."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token.strip():
+        return "token:" + hash_token(token.strip())
+    return "ip:" + (request.remote_addr or "")
+
+
+def token_required(view):
+    """Authenticate `Authorization: Bearer <token>`; sets g.api_trainer_id."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            abort(401, description="Bearer token required.")
+        trainer_id = db.session.scalar(
+            select(ApiToken.trainer_id)
+            .where(ApiToken.token_hash == hash_token(token.strip()))
+        )
+        if trainer_id is None:
+            abort(401, description="Invalid token.")
+        g.api_trainer_id = trainer_id
+        return view(*args, **kwargs)
+    return wrapper
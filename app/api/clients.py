@@ -0,0 +1,100 @@
+from flask import abort, g, request
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Client
+from app.utils import generate_client_public_ids
+
+from . import bp
+from .auth import token_required
+from .common import (
+    Field, bulk_update, choice, integer, paginate, read_items,
+    resolve_ids, rows_response, selected_columns, text, validate_items,
+)
+
+
+FIELDS = {
+    "id": Client.public_id,
+    "name": Client.name,
+    "contact": Client.contact,
+    "notes": Client.notes,
+    "price": Client.price,
+    "status": Client.status,
+    "archived_at": Client.archived_at,
+    "version_id": Client.version_id,
+    "updated_at": Client.updated_at,
+}
+
+WRITABLE = {
+    "name": Field(text(100, min_length=3), required=True),
+    "price": Field(integer(minimum=0), required=True),
+    "status": Field(choice("active", "pause"), default="active"),
+    "contact": Field(text(100)),
+    "notes": Field(text(4096)),
+}
+
+
+@bp.route("/clients", methods=["GET"])
+@token_required
+def list_clients():
+    """Clients by id; ?archived=1 lists archived ones, ?archived=0 active ones."""
+    stmt = select(*selected_columns(FIELDS)).where(
+        Client.trainer_id == g.api_trainer_id
+    )
+    archived = request.args.get("archived")
+    if archived == "1":
+        stmt = stmt.where(Client.archived_at.isnot(None))
+    elif archived == "0":
+        stmt = stmt.where(Client.archived_at.is_(None))
+    return paginate(stmt, [Client.id])
+
+
+@bp.route("/clients", methods=["POST"])
+@token_required
+def create_clients():
+    items = validate_items(read_items(), WRITABLE)
+    public_ids = generate_client_public_ids(len(items))
+    rows = [
+        {**item, "public_id": public_id, "trainer_id": g.api_trainer_id}
+        for item, public_id in zip(items, public_ids)
+    ]
+    try:
+        created = db.session.execute(
+            insert(Client).returning(Client.id, sort_by_parameter_order=True),
+            rows
+        ).scalars().all()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        abort(409, description="Client names must be unique.")
+    return rows_response(_by_ids(created), 201)
+
+
+@bp.route("/clients", methods=["PATCH"])
+@token_required
+def update_clients():
+    items = validate_items(read_items(), WRITABLE, partial=True)
+    ids = resolve_ids(
+        items, Client.public_id, Client.id,
+        Client.trainer_id == g.api_trainer_id
+    )
+    rows = [
+        {"_id": ids[item.pop("id")], **item}
+        for item in items
+    ]
+    try:
+        bulk_update(Client, rows)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        abort(409, description="Client names must be unique.")
+    return rows_response(_by_ids(ids.values()))
+
+
+def _by_ids(ids):
+    return (
+        select(*selected_columns(FIELDS))
+        .where(Client.id.in_(list(ids)))
+        .order_by(Client.id)
+    )
@@ -0,0 +1,269 @@
+"""Field selection, keyset pagination, validation and bulk writes for API resources."""
+import base64
+import json
+import re
+from datetime import datetime
+
+from flask import abort, jsonify, make_response, request
+from sqlalchemy import DateTime, bindparam, select, tuple_, update
+
+from app import db
+from app.utils import json_value
+from app.constants import API_PAGE_SIZE, API_MAX_PAGE_SIZE, API_BULK_MAX_ITEMS
+
+
+# Selection and pagination
+
+def selected_columns(fields: dict) -> list:
+    """
+    Labeled columns for ?fields=a,b (all fields by default). fields maps
+    API names to column expressions; "id" is always included.
+    """
+    requested = request.args.get("fields")
+    if not requested:
+        names = list(fields)
+    else:
+        names = ["id"] + [
+            name.strip() for name in requested.split(",")
+            if name.strip() and name.strip() != "id"
+        ]
+        unknown = [name for name in names if name not in fields]
+        if unknown:
+            abort(400, description=f"Unknown fields: {', '.join(unknown)}.")
+    return [fields[name].label(name) for name in dict.fromkeys(names)]
+
+
+def paginate(stmt, order_by: list):
+    """
+    One page of stmt as a JSON response, ordered by order_by (ending in a
+    unique column) and continued with ?cursor= from the previous page.
+    Rows are read as plain tuples - no ORM objects are built.
+    """
+    limit = request.args.get("limit", API_PAGE_SIZE, type=int)
+    limit = min(max(limit, 1), API_MAX_PAGE_SIZE)
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        stmt = stmt.where(tuple_(*order_by) > tuple_(*_decode_cursor(cursor, order_by)))
+
+    keys = [f"_k{i}" for i in range(len(order_by))]
+    stmt = (
+        stmt.add_columns(*(col.label(key) for col, key in zip(order_by, keys)))
+        .order_by(*order_by)
+        .limit(limit + 1)
+    )
+    rows = db.session.execute(stmt).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor([rows[-1][key] for key in keys])
+    return jsonify(
+        data=[
+            {k: json_value(v) for k, v in row.items() if k not in keys}
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+def rows_response(stmt, status: int = 200):
+    """All rows of stmt as {"data": [...]} - for results of bulk writes."""
+    rows = db.session.execute(stmt).mappings().all()
+    data = [{k: json_value(v) for k, v in row.items()} for row in rows]
+    return jsonify(data=data), status
+
+
+def _encode_cursor(values: list) -> str:
+    raw = json.dumps([json_value(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, order_by: list) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError
+        return [
+            datetime.fromisoformat(v) if isinstance(col.type, DateTime) else v
+            for v, col in zip(values, order_by)
+        ]
+    except (ValueError, TypeError):
+        abort(400, description="Invalid cursor.")
+
+
+# Validation
+
+class Field:
+    """A writable field: parse raises ValueError with a message for the client."""
+
+    def __init__(self, parse, required: bool = False, default=None):
+        self.parse = parse
+        self.required = required
+        self.default = default
+
+
+def text(max_length: int, min_length: int = 0):
+    def parse(value):
+        if value is None and not min_length:
+            return None
+        if not isinstance(value, str):
+            raise ValueError("Must be a string.")
+        value = value.strip()
+        if not min_length <= len(value) <= max_length:
+            raise ValueError(f"Must be {min_length} to {max_length} characters long.")
+        return value or None
+    return parse
+
+
+def integer(minimum: int = None):
+    def parse(value):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError("Must be an integer.")
+        if minimum is not None and value < minimum:
+            raise ValueError(f"Must be at least {minimum}.")
+        return value
+    return parse
+
+
+def boolean():
+    def parse(value):
+        if not isinstance(value, bool):
+            raise ValueError("Must be true or false.")
+        return value
+    return parse
+
+
+def choice(*values):
+    def parse(value):
+        if value not in values:
+            raise ValueError(f"Must be one of: {', '.join(values)}.")
+        return value
+    return parse
+
+
+def pattern(regex: str, message: str):
+    compiled = re.compile(regex)
+
+    def parse(value):
+        if not isinstance(value, str) or not compiled.fullmatch(value):
+            raise ValueError(message)
+        return value
+    return parse
+
+
+def timestamp():
+    def parse(value):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError("Must be an ISO 8601 date and time.")
+        if parsed.tzinfo is None:
+            raise ValueError("Must include a UTC offset.")
+        return parsed
+    return parse
+
+
+def read_items() -> list:
+    """The {"items": [...]} body of a bulk request."""
+    body = request.get_json(silent=True)
+    items = body.get("items") if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        abort(400, description='Expected a JSON body {"items": [...]}.')
+    if len(items) > API_BULK_MAX_ITEMS:
+        abort(400, description=f"At most {API_BULK_MAX_ITEMS} items per request.")
+    if not all(isinstance(item, dict) for item in items):
+        abort(400, description="Every item must be an object.")
+    return items
+
+
+def validate_items(items: list, spec: dict, partial: bool = False) -> list:
+    """
+    Parsed values of every item, all-or-nothing. For creates, missing
+    optional fields get their defaults so all rows share one key set; for
+    updates (partial) only given fields are kept, plus the "id".
+    """
+    parsed, errors = [], []
+    for index, item in enumerate(items):
+        values = {}
+        allowed = set(spec) | ({"id"} if partial else set())
+        for name in item.keys() - allowed:
+            errors.append({"index": index, "field": name, "message": "Unknown field."})
+        if partial and not isinstance(item.get("id"), (str, int)):
+            errors.append({"index": index, "field": "id", "message": "Required."})
+        for name, field in spec.items():
+            if name not in item:
+                if partial:
+                    continue
+                if field.required:
+                    errors.append({"index": index, "field": name, "message": "Required."})
+                    continue
+                values[name] = field.default
+                continue
+            try:
+                values[name] = field.parse(item[name])
+            except ValueError as e:
+                errors.append({"index": index, "field": name, "message": str(e)})
+        if partial:
+            values["id"] = item.get("id")
+        parsed.append(values)
+    if errors:
+        fail(errors)
+    return parsed
+
+
+def fail(errors: list, status: int = 422):
+    """Abort with a list of {"index", "field", "message"} errors."""
+    abort(make_response(jsonify(errors=errors), status))
+
+
+# Bulk writes
+
+def resolve_ids(items: list, key_col, id_col, scope) -> dict:
+    """
+    {api id: primary key} for the items' "id"s, limited by scope (a
+    select condition owning the rows); unknown ids fail the request.
+    """
+    wanted = {item["id"] for item in items}
+    found = dict(db.session.execute(
+        select(key_col, id_col).where(key_col.in_(wanted), scope)
+    ).all())
+    missing = [
+        {"index": i, "field": "id", "message": "Not found."}
+        for i, item in enumerate(items) if item["id"] not in found
+    ]
+    if missing:
+        fail(missing, 404)
+    return found
+
+
+def bulk_update(model, rows: list, extra_values=None):
+    """
+    UPDATE rows given as dicts of {"_id": primary key, column: value},
+    one executemany per distinct set of columns. Versioned tables get
+    their version_id bumped as an ORM update would. extra_values(columns)
+    may add SET expressions for a column set.
+    """
+    table = model.__table__
+    groups = {}
+    for row in rows:
+        columns = tuple(sorted(key for key in row if key != "_id"))
+        if columns:
+            groups.setdefault(columns, []).append(row)
+
+    for columns, group in groups.items():
+        values = {column: bindparam(f"v_{column}") for column in columns}
+        if "version_id" in table.c:
+            values["version_id"] = table.c.version_id + 1
+        if extra_values:
+            values.update(extra_values(columns))
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values(values)
+        )
+        db.session.execute(stmt, [
+            {"_id": row["_id"], **{f"v_{c}": row[c] for c in columns}}
+            for row in group
+        ])
@@ -0,0 +1,89 @@
+from flask import abort, g, request
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Exercise, ExerciseType
+
+from . import bp
+from .auth import token_required
+from .common import (
+    Field, boolean, bulk_update, choice, paginate, read_items,
+    resolve_ids, rows_response, selected_columns, text, validate_items,
+)
+
+
+FIELDS = {
+    "id": Exercise.id,
+    "name": Exercise.name,
+    "type": Exercise.type,
+    "is_active": Exercise.is_active,
+    "description": Exercise.description,
+    "updated_at": Exercise.updated_at,
+}
+
+WRITABLE = {
+    "name": Field(text(90, min_length=1), required=True),
+    "type": Field(
+        choice(*(t.value for t in ExerciseType)),
+        default=ExerciseType.REPS.value
+    ),
+    "is_active": Field(boolean(), default=True),
+    "description": Field(text(1024)),
+}
+
+
+@bp.route("/exercises", methods=["GET"])
+@token_required
+def list_exercises():
+    """Exercises by id; ?active=1 or ?active=0 filters by is_active."""
+    stmt = select(*selected_columns(FIELDS)).where(
+        Exercise.trainer_id == g.api_trainer_id
+    )
+    active = request.args.get("active")
+    if active in ("1", "0"):
+        stmt = stmt.where(Exercise.is_active.is_(active == "1"))
+    return paginate(stmt, [Exercise.id])
+
+
+@bp.route("/exercises", methods=["POST"])
+@token_required
+def create_exercises():
+    items = validate_items(read_items(), WRITABLE)
+    rows = [{**item, "trainer_id": g.api_trainer_id} for item in items]
+    try:
+        created = db.session.execute(
+            insert(Exercise).returning(Exercise.id, sort_by_parameter_order=True),
+            rows
+        ).scalars().all()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        abort(409, description="Exercise names must be unique.")
+    return rows_response(_by_ids(created), 201)
+
+
+@bp.route("/exercises", methods=["PATCH"])
+@token_required
+def update_exercises():
+    items = validate_items(read_items(), WRITABLE, partial=True)
+    ids = resolve_ids(
+        items, Exercise.id, Exercise.id,
+        Exercise.trainer_id == g.api_trainer_id
+    )
+    rows = [{"_id": ids[item.pop("id")], **item} for item in items]
+    try:
+        bulk_update(Exercise, rows)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        abort(409, description="Exercise names must be unique.")
+    return rows_response(_by_ids(ids.values()))
+
+
+def _by_ids(ids):
+    return (
+        select(*selected_columns(FIELDS))
+        .where(Exercise.id.in_(list(ids)))
+        .order_by(Exercise.id)
+    )
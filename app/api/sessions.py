@@ -0,0 +1,166 @@
+from datetime import datetime, timezone
+
+from flask import g, request
+from sqlalchemy import Boolean, and_, bindparam, case, func, insert, select
+
+from app import db
+from app.models import Client, Session, Trainer
+from app.queries import filter_sessions, parse_session_filters
+from app.records import refresh_personal_records
+from app.utils import generate_session_public_ids
+from app.constants import PUBLIC_ID_SIZE_CLIENT
+
+from . import bp
+from .auth import token_required
+from .common import (
+    Field, boolean, bulk_update, choice, fail, integer, paginate, read_items,
+    resolve_ids, rows_response, selected_columns, text, timestamp,
+    validate_items,
+)
+
+
+FIELDS = {
+    "id": Session.public_id,
+    "client_id": Client.public_id,
+    "start_dt": Session.start_dt,
+    "duration_min": Session.duration_min,
+    "status": Session.status,
+    "price": Session.price,
+    "is_paid": Session.is_paid,
+    "payment_date": Session.payment_date,
+    "notes": Session.notes,
+    "group_id": Session.group_id,
+    "version_id": Session.version_id,
+    "updated_at": Session.updated_at,
+}
+
+# Overlap checks of the web forms are not applied: imports may carry
+# history that overlapped
+WRITABLE = {
+    "start_dt": Field(timestamp(), required=True),
+    "duration_min": Field(integer(minimum=1), default=60),
+    "status": Field(choice("planned", "done", "cancelled", "no_show"), default="planned"),
+    "price": Field(integer(minimum=0)),
+    "is_paid": Field(boolean(), default=False),
+    "notes": Field(text(4096)),
+}
+CREATE_ONLY = {
+    "client_id": Field(text(PUBLIC_ID_SIZE_CLIENT, min_length=1), required=True),
+}
+
+
+@bp.route("/sessions", methods=["GET"])
+@token_required
+def list_sessions():
+    """
+    Sessions by start time. Takes the filters of the sessions page:
+    client, status, tag, paid, date_from and date_to.
+    """
+    stmt = (
+        select(*selected_columns(FIELDS))
+        .select_from(Session)
+        .join(Session.client)
+        .where(Client.trainer_id == g.api_trainer_id)
+    )
+    filters = parse_session_filters(request.args)
+    tz_name = "UTC"
+    if filters["date_from"] or filters["date_to"]:
+        # Dates are days in the trainer's timezone
+        tz_name = db.session.scalar(
+            select(Trainer.timezone).where(Trainer.id == g.api_trainer_id)
+        ) or "Europe/Kyiv"
+    stmt = filter_sessions(stmt, filters, tz_name)
+    return paginate(stmt, [Session.start_dt, Session.id])
+
+
+@bp.route("/sessions", methods=["POST"])
+@token_required
+def create_sessions():
+    """Price defaults to the client's; archived clients are read-only."""
+    items = validate_items(read_items(), WRITABLE | CREATE_ONLY)
+
+    clients = {
+        row.public_id: row
+        for row in db.session.execute(
+            select(Client.public_id, Client.id, Client.price).where(
+                Client.public_id.in_({item["client_id"] for item in items}),
+                Client.trainer_id == g.api_trainer_id,
+                Client.archived_at.is_(None)
+            )
+        )
+    }
+    missing = [
+        {"index": i, "field": "client_id", "message": "Not found."}
+        for i, item in enumerate(items) if item["client_id"] not in clients
+    ]
+    if missing:
+        fail(missing, 404)
+
+    public_ids = generate_session_public_ids(len(items))
+    now = datetime.now(timezone.utc)
+    rows = []
+    for item, public_id in zip(items, public_ids):
+        client = clients[item.pop("client_id")]
+        rows.append({
+            **item,
+            "public_id": public_id,
+            "client_id": client.id,
+            "price": client.price if item["price"] is None else item["price"],
+            "payment_date": now if item["is_paid"] else None,
+        })
+    created = db.session.execute(
+        insert(Session).returning(Session.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+    db.session.commit()
+    return rows_response(_by_ids(created), 201)
+
+
+@bp.route("/sessions", methods=["PATCH"])
+@token_required
+def update_sessions():
+    """Updates header fields; done sessions get their personal records refreshed."""
+    items = validate_items(read_items(), WRITABLE, partial=True)
+    ids = resolve_ids(
+        items, Session.public_id, Session.id,
+        Session.client.has(and_(
+            Client.trainer_id == g.api_trainer_id,
+            Client.archived_at.is_(None)
+        ))
+    )
+    status_changed = {ids[item["id"]] for item in items if "status" in item}
+    rows = [{"_id": ids[item.pop("id")], **item} for item in items]
+
+    bulk_update(Session, rows, _payment_date)
+    # Records only count done sessions
+    if status_changed:
+        changed = db.session.execute(
+            select(Session).where(Session.id.in_(status_changed))
+        ).scalars().all()
+        for session_obj in changed:
+            refresh_personal_records(session_obj)
+    db.session.commit()
+    return rows_response(_by_ids(ids.values()))
+
+
+def _payment_date(columns):
+    """Set payment_date along with is_paid, as the session form does."""
+    if "is_paid" not in columns:
+        return {}
+    return {"payment_date": case(
+        (
+            bindparam("v_is_paid", type_=Boolean),
+            func.coalesce(Session.__table__.c.payment_date, func.now())
+        ),
+        else_=None
+    )}
+
+
+def _by_ids(ids):
+    return (
+        select(*selected_columns(FIELDS))
+        .select_from(Session)
+        .join(Session.client)
+        .where(Session.id.in_(list(ids)))
+        .order_by(Session.start_dt, Session.id)
+    )
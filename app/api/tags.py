@@ -0,0 +1,78 @@
+from flask import abort, g
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Tag
+
+from . import bp
+from .auth import token_required
+from .common import (
+    Field, bulk_update, paginate, pattern, read_items,
+    resolve_ids, rows_response, selected_columns, text, validate_items,
+)
+
+
+FIELDS = {
+    "id": Tag.id,
+    "name": Tag.name,
+    "color": Tag.color,
+    "updated_at": Tag.updated_at,
+}
+
+WRITABLE = {
+    "name": Field(text(20, min_length=1), required=True),
+    "color": Field(
+        pattern(r"#[0-9A-Fa-f]{6}", "Must be a #RRGGBB color."),
+        default="#6B7280"
+    ),
+}
+
+
+@bp.route("/tags", methods=["GET"])
+@token_required
+def list_tags():
+    stmt = select(*selected_columns(FIELDS)).where(
+        Tag.trainer_id == g.api_trainer_id
+    )
+    return paginate(stmt, [Tag.id])
+
+
+@bp.route("/tags", methods=["POST"])
+@token_required
+def create_tags():
+    items = validate_items(read_items(), WRITABLE)
+    rows = [{**item, "trainer_id": g.api_trainer_id} for item in items]
+    try:
+        created = db.session.execute(
+            insert(Tag).returning(Tag.id, sort_by_parameter_order=True),
+            rows
+        ).scalars().all()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        abort(409, description="Tag names must be unique.")
+    return rows_response(_by_ids(created), 201)
+
+
+@bp.route("/tags", methods=["PATCH"])
+@token_required
+def update_tags():
+    items = validate_items(read_items(), WRITABLE, partial=True)
+    ids = resolve_ids(items, Tag.id, Tag.id, Tag.trainer_id == g.api_trainer_id)
+    rows = [{"_id": ids[item.pop("id")], **item} for item in items]
+    try:
+        bulk_update(Tag, rows)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        abort(409, description="Tag names must be unique.")
+    return rows_response(_by_ids(ids.values()))
+
+
+def _by_ids(ids):
+    return (
+        select(*selected_columns(FIELDS))
+        .where(Tag.id.in_(list(ids)))
+        .order_by(Tag.id)
+    )
@@ -0,0 +1,171 @@
+"""Maintenance commands, run with `flask --app wsgi <command>`."""
+from datetime import timedelta
+
+import click
+from sqlalchemy import cast, delete, func, select, update
+
+from app import db
+from app.models import (
+    ApiToken, Client, OverdueAction, RequestProfile, Session, Trainer,
+)
+from app.records import refresh_personal_records
+from app.constants import OVERDUE_GRACE_HOURS
+
+
+def register_commands(app):
+    app.cli.add_command(close_overdue)
+    app.cli.add_command(purge_idempotency_keys)
+    app.cli.add_command(purge_sync_tombstones)
+    app.cli.add_command(create_api_token)
+    app.cli.add_command(revoke_api_token)
+    app.cli.add_command(create_profile_token)
+    app.cli.add_command(export_profile)
+
+
+@click.command("close-overdue")
+@click.option(
+    "--grace-hours",
+    default=OVERDUE_GRACE_HOURS,
+    show_default=True,
+    help="Only close sessions that ended at least this long ago.",
+)
+def close_overdue(grace_hours):
+    """
+    Apply each trainer's overdue_action to stale planned sessions.
+    Meant to be run periodically (e.g. a Railway cron service).
+    """
+    cutoff = func.now() - timedelta(hours=grace_hours)
+    # One UPDATE ... FROM clients, trainers for all trainers at once
+    stmt = (
+        update(Session)
+        .where(
+            Session.client_id == Client.id,
+            Client.trainer_id == Trainer.id,
+            Client.archived_at.is_(None),
+            Trainer.overdue_action != OverdueAction.NONE.value,
+            Session.is_overdue,
+            Session.start_dt + func.make_interval(
+                0, 0, 0, 0, 0, Session.duration_min
+            ) < cutoff,
+        )
+        .values(
+            status=cast(Trainer.overdue_action, Session.status.type),
+            # Bulk UPDATEs bypass the ORM version counter
+            version_id=Session.version_id + 1,
+        )
+        .returning(Session.id, Session.status)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        closed = db.session.execute(stmt).all()
+        # Sessions marked done may set new personal records
+        done_ids = [row.id for row in closed if row.status == "done"]
+        if done_ids:
+            done_sessions = db.session.execute(
+                select(Session).where(Session.id.in_(done_ids))
+            ).scalars().all()
+            for session_obj in done_sessions:
+                refresh_personal_records(session_obj)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    click.echo(f"Closed {len(closed)} overdue session(s).")
+
+
+@click.command("purge-idempotency-keys")
+def purge_idempotency_keys():
+    """Delete idempotency keys older than IDEMPOTENCY_KEY_TTL_HOURS."""
+    from app.idempotency import purge_expired_keys
+    click.echo(f"Purged {purge_expired_keys()} idempotency key(s).")
+
+
+@click.command("purge-sync-tombstones")
+def purge_sync_tombstones():
+    """Delete sync tombstones older than SYNC_TOMBSTONE_TTL_DAYS."""
+    from app.sync import purge_tombstones
+    click.echo(f"Purged {purge_tombstones()} sync tombstone(s).")
+
+
+@click.command("create-api-token")
+@click.argument("email")
+@click.argument("name")
+def create_api_token(email, name):
+    """Create an API token NAME for the trainer with EMAIL and print it once."""
+    from app.api.auth import hash_token, new_token
+    trainer_id = db.session.scalar(select(Trainer.id).where(Trainer.email == email))
+    if trainer_id is None:
+        raise click.ClickException(f"No trainer with email {email}.")
+
+    token = new_token()
+    db.session.add(ApiToken(
+        trainer_id=trainer_id,
+        name=name,
+        token_hash=hash_token(token),
+    ))
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise click.ClickException(f"Token {name} already exists.")
+    click.echo(token)
+
+
+@click.command("revoke-api-token")
+@click.argument("email")
+@click.argument("name")
+def revoke_api_token(email, name):
+    """Delete the API token NAME of the trainer with EMAIL."""
+    result = db.session.execute(
+        delete(ApiToken).where(
+            ApiToken.name == name,
+            ApiToken.trainer_id == select(Trainer.id)
+            .where(Trainer.email == email)
+            .scalar_subquery()
+        )
+    )
+    db.session.commit()
+    click.echo(f"Revoked {result.rowcount} token(s).")
+
+
+@click.command("create-profile-token")
+@click.argument("email")
+def create_profile_token(email):
+    """
+    Print a token that profiles requests of the trainer with EMAIL when
+    sent as the X-Profile header or _profile query argument.
+    """
+    from app.profiling import create_token
+    trainer_id = db.session.scalar(select(Trainer.id).where(Trainer.email == email))
+    if trainer_id is None:
+        raise click.ClickException(f"No trainer with email {email}.")
+    click.echo(create_token(trainer_id))
+
+
+@click.command("export-profile")
+@click.argument("profile_id", type=int)
+@click.option("--output", "-o", help="Where to write pstats data [profile-ID.prof].")
+@click.option("--top", default=10, show_default=True, help="Slowest queries to list.")
+def export_profile(profile_id, output, top):
+    """Write a stored request profile as a .prof file and summarize its SQL."""
+    profile = db.session.get(RequestProfile, profile_id)
+    if profile is None:
+        raise click.ClickException(f"No profile {profile_id}.")
+
+    output = output or f"profile-{profile_id}.prof"
+    with open(output, "wb") as f:
+        f.write(profile.stats)
+
+    click.echo(
+        f"{profile.method} {profile.path} -> {profile.status_code} "
+        f"(trainer {profile.trainer_id}, {profile.created_at:%Y-%m-%d %H:%M})"
+    )
+    click.echo(
+        f"{profile.duration_ms} ms total, {len(profile.queries)} queries "
+        f"in {profile.sql_ms} ms"
+    )
+    for query in sorted(profile.queries, key=lambda q: q["ms"], reverse=True)[:top]:
+        sql = " ".join(query["sql"].split())
+        click.echo(f"{query['ms']:9.2f} ms  {sql[:120]}")
+    click.echo(f"Wrote {output}")
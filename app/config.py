@@ -13,6 +13,31 @@ class DevelopmentConfig:
     SECRET_KEY = os.environ.get("SECRET_KEY")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL")
+    # Bounds connection attempts, so /readyz fails fast without a database
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "connect_args": {
+            "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", 5)),
+        },
+    }
+
+    # Password hashing - see app/utils/passwords.py
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_SALT_LENGTH = int(os.environ.get("PASSWORD_HASH_SALT_LENGTH", 16))
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 10))
+
+    # Worker warm-up - see app/warmup.py
+    TEMPLATE_CACHE_DIR = os.environ.get("TEMPLATE_CACHE_DIR")
+    WARMUP_POOL_CONNECTIONS = int(os.environ.get("WARMUP_POOL_CONNECTIONS", 4))
+
+    # Signed-token request profiling - see app/profiling.py
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED") == "1"
+
+    # OpenTelemetry tracing - see app/tracing.py. Spans go to stdout
+    # unless TRACING_FILE is set; the ratio samples new traces only
+    TRACING_ENABLED = os.environ.get("TRACING_ENABLED") == "1"
+    TRACING_SAMPLE_RATIO = float(os.environ.get("TRACING_SAMPLE_RATIO", 1.0))
+    TRACING_FILE = os.environ.get("TRACING_FILE")
 
 
 class ProductionConfig:
@@ -20,6 +45,31 @@ class ProductionConfig:
     SECRET_KEY = os.environ.get("SECRET_KEY")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL")
+    # Bounds connection attempts, so /readyz fails fast without a database
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "connect_args": {
+            "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", 5)),
+        },
+    }
+
+    # Password hashing - see app/utils/passwords.py
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_SALT_LENGTH = int(os.environ.get("PASSWORD_HASH_SALT_LENGTH", 16))
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 10))
+
+    # Worker warm-up - see app/warmup.py
+    TEMPLATE_CACHE_DIR = os.environ.get("TEMPLATE_CACHE_DIR")
+    WARMUP_POOL_CONNECTIONS = int(os.environ.get("WARMUP_POOL_CONNECTIONS", 4))
+
+    # Signed-token request profiling - see app/profiling.py
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED") == "1"
+
+    # OpenTelemetry tracing - see app/tracing.py. Spans go to stdout
+    # unless TRACING_FILE is set; the ratio samples new traces only
+    TRACING_ENABLED = os.environ.get("TRACING_ENABLED") == "1"
+    TRACING_SAMPLE_RATIO = float(os.environ.get("TRACING_SAMPLE_RATIO", 1.0))
+    TRACING_FILE = os.environ.get("TRACING_FILE")
     
     # Railway/Production
     SESSION_COOKIE_SECURE = True  # HTTPS only
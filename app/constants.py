@@ -1,3 +1,73 @@
 PUBLIC_ID_SIZE_CLIENT = 6
 PUBLIC_ID_SIZE_SESSION = 8
 MAX_PUBLIC_ID_RETRIES = 3
+
+# Client card lazy-loaded sections
+CLIENT_UPCOMING_LIMIT = 5
+CLIENT_RECENT_LIMIT = 10
+CLIENT_UNPAID_LIMIT = 20
+CLIENT_HISTORY_PAGE_SIZE = 20
+# Every card sends one request per section - the default per-route limit
+# would cut off a trainer going through a few clients
+CLIENT_SECTIONS_RATE_LIMIT = "240 per minute"
+
+# Exercise progress charts: max points returned after downsampling
+PROGRESS_DEFAULT_POINTS = 100
+PROGRESS_MAX_POINTS = 500
+
+# Free-slot finder defaults and the widest searchable range
+FREE_SLOTS_WORK_START = "08:00"
+FREE_SLOTS_WORK_END = "20:00"
+FREE_SLOTS_DEFAULT_DAYS = 7
+FREE_SLOTS_MAX_DAYS = 14
+
+# Overdue planned sessions are auto-closed only after this grace period
+OVERDUE_GRACE_HOURS = 24
+
+# Group sessions: max clients in one group workout
+GROUP_SESSION_MAX_CLIENTS = 30
+
+# Idempotency keys of mutating requests are kept this long
+IDEMPOTENCY_KEY_TTL_HOURS = 24
+# Keys of the latest quick-logged sets kept per exercise row, so a delayed
+# retry of any of them is recognised (see app/routes/live.py)
+LIVE_LOG_KEYS_KEPT = 10
+
+# Delta sync (see app/sync.py)
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 2000
+# Writes are assumed to commit within this long; newer rows are re-sent
+SYNC_SETTLE_SECONDS = 60
+# Tombstones are purged after this; older cursors must resync from scratch
+SYNC_TOMBSTONE_TTL_DAYS = 30
+
+# JSON API (see app/api)
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+API_BULK_MAX_ITEMS = 100
+# Shared by all API endpoints, per bearer token
+API_RATE_LIMIT = "600 per minute"
+
+# Authenticated trainer identity, cached per worker (see app/identity.py)
+IDENTITY_CACHE_TTL = 60
+
+# Streamed list pages (see app/utils/streaming.py): rows fetched per
+# round trip and bytes buffered before a chunk is sent
+STREAM_YIELD_PER = 200
+STREAM_CHUNK_SIZE = 8 * 1024
+
+# Response compression (see app/utils/compression.py)
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_MIMETYPES = (
+    "text/html", "text/css", "text/plain", "text/javascript",
+    "application/javascript", "application/json", "image/svg+xml",
+)
+# Fingerprinted static assets never change under the same URL
+STATIC_IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# On-demand request profiling (see app/profiling.py)
+PROFILE_TOKEN_MAX_AGE_HOURS = 24
+PROFILE_TTL_DAYS = 7
+
+# Readiness probe (see app/health.py): the database check's statement timeout
+HEALTH_DB_TIMEOUT_MS = 1000
@@ -5,6 +5,7 @@ from .exercises import AddExerciseForm, EditExerciseForm
 from .tags import AddTagForm, EditTagForm
 from .sessions import (
     AddSessionForm, SessionExercisesHelperForm,
-    EditSessionForm,
+    EditSessionForm, GroupSessionForm,
 )
-from .user import RegisterForm, LoginForm
+from .templates import SaveTemplateForm, ApplyTemplateForm
+from .user import RegisterForm, LoginForm, SettingsForm, ChangePasswordForm
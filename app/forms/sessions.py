@@ -1,7 +1,7 @@
 from flask_wtf import FlaskForm
 from wtforms import (
     BooleanField, IntegerField, SelectField,
-    TextAreaField, DateTimeField,
+    SelectMultipleField, TextAreaField, DateTimeField,
     FieldList, FormField, Form,
     SubmitField, DecimalField,
 )
@@ -118,6 +118,24 @@ class EditSessionForm(SessionHeaderBaseForm):
     is_paid = BooleanField("Paid?")
     submit = SubmitField("Save")
 
+class GroupSessionForm(SessionHeaderBaseForm):
+    # Price comes from each client, optionally overridden per client
+    price = None
+    clients = SelectMultipleField(
+        "Clients",
+        coerce=int,
+        choices=[],
+        validators=[
+            DataRequired(message="Select at least one client.")
+        ]
+    )
+    exercises = FieldList(
+        FormField(AddSessionExerciseForm),
+        min_entries=0,
+        max_entries=30
+    )
+    submit = SubmitField("Add")
+
 class SessionExercisesHelperForm(Form):
     exercises = FieldList(
         FormField(AddSessionExerciseForm),
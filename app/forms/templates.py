@@ -0,0 +1,35 @@
+from flask_wtf import FlaskForm
+from wtforms import DateTimeField, SelectField, StringField, SubmitField
+from wtforms.validators import DataRequired, Length, NumberRange
+
+
+class SaveTemplateForm(FlaskForm):
+    name = StringField(
+        "Template Name",
+        validators=[
+            DataRequired(message="Template name is required."),
+            Length(
+                max=100,
+                message="Template name must be at most 100 characters long."
+            )
+        ]
+    )
+    submit = SubmitField("Save as template")
+
+
+class ApplyTemplateForm(FlaskForm):
+    client = SelectField(
+        "Client",
+        coerce=int,
+        choices=[],
+        validators=[
+            DataRequired(message="Client selection is required."),
+            NumberRange(min=1, message="Please select a client.")
+        ]
+    )
+    start_dt = DateTimeField(
+        "Starts at:",
+        format="%Y-%m-%dT%H:%M",
+        validators=[DataRequired(message="Start date and time is required.")]
+    )
+    submit = SubmitField("Create session")
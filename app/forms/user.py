@@ -1,7 +1,7 @@
 from flask_wtf import FlaskForm
 from wtforms import (
     StringField, EmailField, PasswordField,
-    SubmitField, BooleanField
+    SubmitField, BooleanField, SelectField,
 )
 from wtforms.validators import (
     DataRequired, Email, Length,
@@ -85,3 +85,47 @@ class LoginForm(FlaskForm):
     )
     remember_me = BooleanField('Remember Me')
     submit = SubmitField('Login')
+
+
+class SettingsForm(FlaskForm):
+    overdue_action = SelectField(
+        'Overdue sessions',
+        choices=[
+            ('none', 'Keep in the overdue list'),
+            ('done', 'Mark as done'),
+            ('no_show', 'Mark as no show'),
+            ('cancelled', 'Mark as cancelled'),
+        ],
+        validators=[DataRequired(message="Please choose an option.")]
+    )
+    submit = SubmitField('Save')
+
+
+class ChangePasswordForm(FlaskForm):
+    current_password = PasswordField(
+        'Current Password',
+        validators=[
+            DataRequired(message="Current password is required."),
+            Length(max=1024, message="That's too long, nope.")
+        ]
+    )
+    password = PasswordField(
+        'New Password',
+        validators=[
+            DataRequired(message="Password is required."),
+            Length(
+                min=8,
+                message="Password must be at least 8 characters long."
+            ),
+            Length(max=1024, message="That's too long, nope.")
+        ]
+    )
+    password2 = PasswordField(
+        'Confirm New Password',
+        validators=[
+            DataRequired(message="Please confirm your password."),
+            Length(max=1024, message="Nope, just don't."),
+            EqualTo('password', message="Passwords must match.")
+        ]
+    )
+    submit = SubmitField('Change password')
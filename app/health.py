@@ -0,0 +1,58 @@
+"""
+Liveness and readiness probes for the platform.
+
+/healthz answers as long as the worker serves requests. /readyz also
+needs a free pool connection and a database that answers within
+HEALTH_DB_TIMEOUT_MS; an exhausted pool is reported without waiting for
+a checkout. Both skip auth and rate limiting and touch no session.
+"""
+from flask import jsonify
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db, limiter
+from app.constants import HEALTH_DB_TIMEOUT_MS
+
+
+def init_health(app):
+    app.add_url_rule("/healthz", "healthz", limiter.exempt(_healthz))
+    app.add_url_rule("/readyz", "readyz", limiter.exempt(_readyz))
+
+
+def pool_status() -> dict:
+    pool = db.engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    saturated = getattr(pool, "saturated", None)
+    status["saturated"] = bool(saturated and saturated())
+    return status
+
+
+def _healthz():
+    return _probe({"status": "ok"}, 200)
+
+
+def _readyz():
+    pool = pool_status()
+    if pool["saturated"]:
+        return _probe({"status": "pool exhausted", "pool": pool}, 503)
+    try:
+        with db.engine.begin() as connection:
+            # Transaction-local, so the pooled connection keeps its defaults
+            connection.execute(select(func.set_config(
+                "statement_timeout", str(HEALTH_DB_TIMEOUT_MS), True
+            )))
+            connection.execute(select(1))
+    except SQLAlchemyError:
+        return _probe({"status": "database unavailable", "pool": pool}, 503)
+    return _probe({"status": "ok", "pool": pool}, 200)
+
+
+def _probe(body: dict, status: int):
+    response = jsonify(body)
+    response.status_code = status
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,201 @@
+"""
+Idempotency keys for mutating requests.
+
+Forms carry a hidden `idempotency_key` field and HTMX elements an
+`Idempotency-Key` header, both rendered fresh per page. The key row is
+inserted by a before_commit hook, so it commits in the same transaction
+as the view's write: a request that never committed leaves no key and
+can simply be retried. The redirect or HTMX fragment is recorded on the
+row afterwards and replayed for retries without running the view again.
+"""
+from datetime import timedelta
+from functools import wraps
+
+from flask import (
+    Response, current_app, g, has_request_context, make_response,
+    redirect, request,
+)
+from flask_login import current_user
+from markupsafe import Markup
+from nanoid import generate
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models import IdempotencyKey
+from app.constants import IDEMPOTENCY_KEY_TTL_HOURS
+
+
+KEY_FIELD = "idempotency_key"
+KEY_HEADER = "Idempotency-Key"
+
+
+class DuplicateRequest(Exception):
+    """
+    Another request with the same key committed first. Views re-raise it
+    from broad except blocks so no error flash is left behind.
+    """
+
+
+def idempotent(view):
+    """Replay the stored outcome of POSTs whose key was already used."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(KEY_HEADER) or request.form.get(KEY_FIELD)
+        if (
+            request.method != "POST"
+            or not key
+            or len(key) > 64
+            or not current_user.is_authenticated
+        ):
+            return view(*args, **kwargs)
+
+        row = _live_key(key)
+        if row is not None:
+            return _replay(row)
+
+        g.idempotency = {"key": key, "committed": False, "duplicate": False}
+        try:
+            response = make_response(view(*args, **kwargs))
+        except DuplicateRequest:
+            response = None
+        finally:
+            state = g.pop("idempotency")
+
+        if state["duplicate"]:
+            # Lost the race - this request's writes were rolled back
+            db.session.rollback()
+            return _replay(_live_key(key))
+        if state["committed"]:
+            _store(key, response)
+        return response
+    return wrapper
+
+
+def purge_expired_keys() -> int:
+    """Delete keys past their TTL; returns the number removed."""
+    result = db.session.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.created_at < _cutoff())
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def init_idempotency(app):
+    app.jinja_env.globals["idempotency_key"] = new_key
+    app.jinja_env.globals["idempotency_field"] = lambda: Markup(
+        f'<input type="hidden" name="{KEY_FIELD}" value="{new_key()}">'
+    )
+    event.listen(db.session, "before_commit", _claim_on_commit)
+    event.listen(db.session, "after_commit", _mark_committed)
+
+
+def new_key() -> str:
+    return generate(size=21)
+
+
+def _cutoff():
+    return func.now() - timedelta(hours=IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def _pending():
+    if not has_request_context():
+        return None
+    return g.get("idempotency")
+
+
+def _claim_on_commit(session):
+    """
+    Insert the key, or take over an expired one, in the transaction being
+    committed. A live key means a concurrent retry committed first (the
+    INSERT waits for it), so this commit is aborted.
+    """
+    state = _pending()
+    if state is None or state["committed"]:
+        return
+    stmt = insert(IdempotencyKey).values(
+        trainer_id=current_user.id,
+        key=state["key"],
+        endpoint=request.endpoint,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["trainer_id", "key"],
+        set_={
+            "endpoint": stmt.excluded.endpoint,
+            "status_code": None,
+            "location": None,
+            "body": None,
+            "created_at": func.now(),
+        },
+        where=IdempotencyKey.created_at < _cutoff()
+    ).returning(IdempotencyKey.key)
+    if session.execute(stmt).scalar() is None:
+        state["duplicate"] = True
+        raise DuplicateRequest()
+
+
+def _mark_committed(session):
+    state = _pending()
+    if state is not None:
+        state["committed"] = True
+
+
+def _live_key(key: str):
+    return db.session.execute(
+        select(IdempotencyKey).where(
+            IdempotencyKey.trainer_id == current_user.id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.created_at >= _cutoff()
+        )
+    ).scalar_one_or_none()
+
+
+def _replay(row) -> Response:
+    if row is None or row.endpoint != request.endpoint:
+        return Response("Idempotency key reused for another request.", 422)
+    if row.status_code is None:
+        # The write committed but its response was not recorded
+        if request.headers.get("HX-Request"):
+            response = Response(status=204)
+            response.headers["HX-Refresh"] = "true"
+        else:
+            response = redirect(request.referrer or request.url)
+    else:
+        response = Response(row.body or "", status=row.status_code)
+        if row.location:
+            response.headers["Location"] = row.location
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _store(key: str, response: Response):
+    """
+    Record redirects and HTMX fragments on the committed key. Anything else
+    replays as the generic "already applied" response.
+    """
+    is_redirect = 300 <= response.status_code < 400
+    is_fragment = (
+        request.headers.get("HX-Request")
+        and response.status_code < 500
+        and not response.direct_passthrough
+    )
+    if not (is_redirect or is_fragment):
+        return
+    try:
+        db.session.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.trainer_id == current_user.id,
+                IdempotencyKey.key == key
+            )
+            .values(
+                status_code=response.status_code,
+                location=response.headers.get("Location"),
+                body=None if is_redirect else response.get_data(as_text=True),
+            )
+        )
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        current_app.logger.exception("Could not record idempotent response")
@@ -0,0 +1,80 @@
+"""
+Flask-Login user loader backed by a per-worker cache.
+
+current_user is a TrainerIdentity: the few trainer fields views read,
+without password_hash and without a Trainer row loaded per request. The
+login session stores "<id>:<credential_version>" (see Trainer.get_id), so
+a password change - which bumps the version - signs out other sessions as
+soon as their cached identity is refreshed. Views that change the trainer
+load the Trainer row and call invalidate_identity() after committing;
+other workers pick the change up within IDENTITY_CACHE_TTL.
+"""
+from dataclasses import dataclass
+
+from flask_login import UserMixin
+from sqlalchemy import select
+
+from app import db, login_manager
+from app.models import Trainer
+from app.utils import TTLCache
+from app.constants import IDENTITY_CACHE_TTL
+
+
+_identities = TTLCache(ttl=IDENTITY_CACHE_TTL, maxsize=4096, name="identity")
+
+
+@dataclass(frozen=True, eq=False)
+class TrainerIdentity(UserMixin):
+    id: int
+    name: str
+    timezone: str
+    currency: str
+    overdue_action: str
+    credential_version: int
+
+    def get_id(self):
+        return f"{self.id}:{self.credential_version}"
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    trainer_id, _, version = user_id.partition(":")
+    try:
+        trainer_id = int(trainer_id)
+        version = int(version) if version else None
+    except ValueError:
+        return None
+
+    identity = _identities.get(trainer_id)
+    if identity is None or (
+        version is not None and identity.credential_version != version
+    ):
+        identity = _load_identity(trainer_id)
+        if identity is None:
+            return None
+        _identities.set(trainer_id, identity)
+
+    # Sessions from before the stamp existed stay valid until the first
+    # password change
+    expected = version if version is not None else 1
+    if identity.credential_version != expected:
+        return None
+    return identity
+
+
+def invalidate_identity(trainer_id: int):
+    _identities.invalidate(trainer_id)
+
+
+def _load_identity(trainer_id: int):
+    row = db.session.execute(
+        select(
+            Trainer.id,
+            Trainer.name,
+            Trainer.timezone,
+            Trainer.currency,
+            Trainer.overdue_action,
+            Trainer.credential_version,
+        ).where(Trainer.id == trainer_id)
+    ).first()
+    return TrainerIdentity(*row) if row else None
@@ -0,0 +1,161 @@
+"""
+Prometheus metrics: request latency and status per endpoint, database
+pool checkout wait and overflow, rate limiter rejections and in-process
+cache hit rates.
+
+Under gunicorn each worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+(set up in gunicorn.conf.py) and /metrics aggregates all of them, so a
+scrape sees the whole instance whichever worker answers it. /metrics is
+only served to loopback addresses - run the scraper as a sidecar.
+"""
+import ipaddress
+import os
+import time
+
+from flask import Response, abort, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to produce a response (first byte for streamed pages).",
+    ["endpoint", "method", "kind"],
+)
+RESPONSES = Counter(
+    "http_responses",
+    "Responses by status.",
+    ["endpoint", "method", "status", "kind"],
+)
+RATE_LIMITED = Counter(
+    "http_rate_limited",
+    "Requests rejected by the rate limiter.",
+    ["endpoint"],
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts",
+    "Checkouts that gave up waiting for a connection.",
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out.",
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size.",
+    multiprocess_mode="livesum",
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups",
+    "In-process cache lookups (see app/utils/cache.py).",
+    ["cache", "result"],
+)
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool reporting checkout wait, timeouts and pool usage."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+        self._report()
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._report()
+
+    def saturated(self) -> bool:
+        """Every connection, overflow included, is checked out."""
+        return (
+            self._max_overflow > -1
+            and self.checkedout() >= self.size() + self._max_overflow
+        )
+
+    def _report(self):
+        POOL_CHECKED_OUT.set(self.checkedout())
+        POOL_OVERFLOW.set(max(self.overflow(), 0))
+
+
+def init_metrics(app):
+    """
+    Call before db.init_app, since the pool class is an engine option, and
+    before limiter.init_app, so rejected requests are timed too.
+    """
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    options.setdefault("poolclass", MeteredQueuePool)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+    app.before_request(_start_timer)
+    app.after_request(_record_response)
+
+    from app import limiter
+    app.add_url_rule("/metrics", "metrics", limiter.exempt(_metrics))
+
+
+def record_rate_limited(limit=None):
+    """Flask-Limiter on_breach callback."""
+    RATE_LIMITED.labels(request.endpoint or "unmatched").inc()
+
+
+def request_kind() -> str:
+    """api, boosted (partial page), htmx (fragment) or page."""
+    if request.blueprint == "api_v1":
+        return "api"
+    if "HX-Boosted" in request.headers:
+        return "boosted"
+    if "HX-Request" in request.headers:
+        return "htmx"
+    return "page"
+
+
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+def _record_response(response):
+    started = g.pop("request_started", None)
+    # Scrapes and platform probes would drown out user traffic
+    if started is None or request.endpoint in ("metrics", "healthz", "readyz"):
+        return response
+    # Unmatched URLs share one label to keep cardinality bounded
+    endpoint = request.endpoint or "unmatched"
+    kind = request_kind()
+    REQUEST_LATENCY.labels(endpoint, request.method, kind).observe(
+        time.perf_counter() - started
+    )
+    RESPONSES.labels(endpoint, request.method, response.status_code, kind).inc()
+    return response
+
+
+def _metrics():
+    if not ipaddress.ip_address(request.remote_addr or "0.0.0.0").is_loopback:
+        abort(404)
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -1,14 +1,17 @@
 from datetime import datetime, timezone
 
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime,
-    Enum, ForeignKey, Boolean, CheckConstraint,
-    UniqueConstraint, Index, Numeric, text,
+    Column, Integer, BigInteger, String, Text, DateTime,
+    Enum, ForeignKey, Boolean, CheckConstraint, JSON, LargeBinary,
+    UniqueConstraint, Index, Numeric, Sequence, FetchedValue,
+    text, func, and_,
 )
 from enum import Enum as PyEnum
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import expression
-from app import db, login_manager
+from app import db
 from flask_login import UserMixin
 
 from app.constants import (
@@ -21,6 +24,31 @@ from app.utils import (
 )
 
 
+# Global change counter for delta sync (see SyncTracked)
+change_sequence = Sequence("change_seq", metadata=db.Model.metadata)
+
+
+class SyncTracked:
+    """
+    Columns for delta sync. Inserts take the next change_seq; the
+    sync_touch trigger bumps both on UPDATE and sync_tombstone records
+    DELETEs (see migrations).
+    """
+
+    change_seq = Column(
+        BigInteger,
+        nullable=False,
+        server_default=change_sequence.next_value(),
+        server_onupdate=FetchedValue()
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.clock_timestamp(),
+        server_onupdate=FetchedValue()
+    )
+
+
 class ExerciseType(str, PyEnum):
     """ Helper enum for exercise types. """
 
@@ -28,6 +56,24 @@ class ExerciseType(str, PyEnum):
     TIME = "time" # cardio, planks, etc.
 
 
+class OverdueAction(str, PyEnum):
+    """ Helper enum for what the auto-close job does with overdue sessions. """
+
+    NONE = "none"  # keep them in the overdue inbox
+    DONE = "done"
+    NO_SHOW = "no_show"
+    CANCELLED = "cancelled"
+
+
+class RecordMetric(str, PyEnum):
+    """ Helper enum for personal record metrics. """
+
+    WEIGHT = "weight"  # heaviest working weight
+    E1RM = "e1rm"  # estimated one-rep max (Epley)
+    VOLUME = "volume"  # sets x reps x weight of one exercise row
+    TIME = "time"  # longest set of a time-based exercise
+
+
 class Trainer(db.Model, UserMixin):
     """Represents a trainer - main user of the system."""
 
@@ -48,6 +94,27 @@ class Trainer(db.Model, UserMixin):
         server_default="UAH"
     )
 
+    # Stamped into the login session (see get_id); bumping it on a
+    # password change signs out every other session
+    credential_version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Applied by the `flask close-overdue` job to stale planned sessions
+    overdue_action = Column(
+        String(10),
+        nullable=False,
+        default=OverdueAction.NONE.value,
+        server_default=OverdueAction.NONE.value
+    )
+
+    __table_args__ = (
+        CheckConstraint(
+            "overdue_action IN ({})".format(
+                ", ".join(f"'{a.value}'" for a in OverdueAction)
+            ),
+            name="ck_trainer_overdue_action_valid"
+        ),
+    )
+
     # One-to-many: a trainer can have many clients
     clients = relationship(
         "Client",
@@ -71,15 +138,11 @@ class Trainer(db.Model, UserMixin):
         passive_deletes=True
     )
 
-@login_manager.user_loader
-def load_user(user_id):
-    try:
-        return db.session.get(Trainer, int(user_id))
-    except (ValueError, TypeError):
-        return None
+    def get_id(self):
+        return f"{self.id}:{self.credential_version}"
 
 
-class Client(db.Model):
+class Client(SyncTracked, db.Model):
     """Represents a client - no own login, all data operated an added by the trainer"""
 
     __tablename__ = "clients"
@@ -107,6 +170,8 @@ class Client(db.Model):
         server_default="active"
     )
     archived_at = Column(DateTime(timezone=True), nullable=True)
+    # Optimistic locking - bumped by every ORM update of the row
+    version_id = Column(Integer, nullable=False, default=1, server_default="1")
 
     # Many-to-one: each client can have only one trainer
     trainer = relationship("Trainer", back_populates="clients")
@@ -124,10 +189,12 @@ class Client(db.Model):
     __table_args__ = (
         UniqueConstraint('trainer_id', 'name', name='uq_client_name_per_trainer'),
         CheckConstraint("price >= 0", name="ck_client_price_nonnegative"),
+        Index("ix_clients_trainer_change_seq", "trainer_id", "change_seq"),
     )
+    __mapper_args__ = {"version_id_col": version_id}
 
 
-class Session(db.Model):
+class Session(SyncTracked, db.Model):
     """Represents a training session - schedule, result, payment status."""
 
     __tablename__ = "sessions"
@@ -163,11 +230,33 @@ class Session(db.Model):
     )
     payment_date = Column(DateTime(timezone=True))
     notes = Column(Text)
+    # Shared by sessions created together as one group workout
+    group_id = Column(String(PUBLIC_ID_SIZE_SESSION), nullable=True, index=True)
+    # Optimistic locking - see Client.version_id. Edits that only touch
+    # exercises or tags must bump it explicitly (see bump_version)
+    version_id = Column(Integer, nullable=False, default=1, server_default="1")
 
     __table_args__ = (
         CheckConstraint("price >= 0", name="ck_session_price_nonnegative"),
         CheckConstraint("duration_min > 0", name="ck_session_duration_positive"),
+        # Client card sections and history keyset pagination
+        Index("ix_sessions_client_start", "client_id", "start_dt", "id"),
+        # Overlap checks - session_range() is an SQL function (see migrations)
+        Index(
+            "ix_sessions_time_range",
+            func.session_range(start_dt, duration_min),
+            postgresql_using="gist",
+            postgresql_where=text("status <> 'cancelled'")
+        ),
+        # Overdue lookups - see Session.is_overdue
+        Index(
+            "ix_sessions_planned_start",
+            "start_dt",
+            postgresql_where=text("status = 'planned'")
+        ),
+        Index("ix_sessions_change_seq", "change_seq"),
     )
+    __mapper_args__ = {"version_id_col": version_id}
 
     client = relationship("Client", back_populates="sessions")
     session_exercises = relationship(
@@ -183,13 +272,24 @@ class Session(db.Model):
         passive_deletes=True
     )
 
-    @property
+    @hybrid_property
     def is_overdue(self):
         from datetime import timedelta
         end_dt = self.start_dt + timedelta(minutes=self.duration_min)
         return self.status == "planned" and end_dt < datetime.now(timezone.utc)
 
-class Exercise(db.Model):
+    @is_overdue.inplace.expression
+    @classmethod
+    def _is_overdue_expression(cls):
+        # start_dt < now() is implied by the end check but gives the planner
+        # a range on ix_sessions_planned_start
+        return and_(
+            cls.status == "planned",
+            cls.start_dt < func.now(),
+            cls.start_dt + func.make_interval(0, 0, 0, 0, 0, cls.duration_min) < func.now()
+        )
+
+class Exercise(SyncTracked, db.Model):
     """Represents an exercise - reusable, can be linked to multiple sessions."""
 
     __tablename__ = "exercises"
@@ -224,11 +324,12 @@ class Exercise(db.Model):
         CheckConstraint(
             f"type IN ('{ExerciseType.REPS.value}', '{ExerciseType.TIME.value}')",
             name="ck_exercise_type_valid"
-        )
+        ),
+        Index("ix_exercises_trainer_change_seq", "trainer_id", "change_seq"),
     )
 
 
-class SessionExercise(db.Model):
+class SessionExercise(SyncTracked, db.Model):
     """Represents an exercise performed in a specific session with details."""
 
     __tablename__ = "session_exercises"
@@ -256,6 +357,14 @@ class SessionExercise(db.Model):
     reps = Column(Integer, nullable=True)
     time_seconds = Column(Integer, nullable=True)  # for time-based exercises
     weight = Column(Numeric(5, 2), nullable=False, default=0, server_default=text("0"))
+    # Idempotency keys of the latest quick-logged sets, newest first -
+    # replays are no-ops
+    recent_log_keys = Column(
+        ARRAY(String(21)),
+        nullable=False,
+        default=list,
+        server_default=text("'{}'")
+    )
 
     __table_args__ = (
         CheckConstraint("sets > 0", name="ck_session_exercise_sets_positive"),
@@ -268,14 +377,15 @@ class SessionExercise(db.Model):
             "num_nonnulls(reps, time_seconds) = 1",
             name="ck_session_exercise_one_metric_required"
         ),
-        Index("ix_se_client_exercise", "client_id", "exercise_id")
+        Index("ix_se_client_exercise", "client_id", "exercise_id"),
+        Index("ix_se_change_seq", "change_seq"),
     )
 
     session = relationship("Session", back_populates="session_exercises")
     exercise = relationship("Exercise", back_populates="session_exercises")
 
 
-class Tag(db.Model):
+class Tag(SyncTracked, db.Model):
     """Represents a tag to label sessions - reusable, can be linked to multiple sessions."""
 
     __tablename__ = "tags"
@@ -304,6 +414,7 @@ class Tag(db.Model):
 
     __table_args__ = (
         UniqueConstraint('trainer_id', 'name', name='uq_tag_name_per_trainer'),
+        Index("ix_tags_trainer_change_seq", "trainer_id", "change_seq"),
     )
 
 
@@ -324,5 +435,239 @@ class SessionTag(db.Model):
         primary_key=True
     )
 
+    # Reverse of the (session_id, tag_id) PK - for filtering sessions by tag
+    __table_args__ = (
+        Index("ix_session_tags_tag_session", "tag_id", "session_id"),
+    )
+
     session = relationship("Session", back_populates="session_tags")
-    tag = relationship("Tag", back_populates="session_tags")
\ No newline at end of file
+    tag = relationship("Tag", back_populates="session_tags")
+
+
+class PersonalRecord(db.Model):
+    """Best result of a client per exercise and metric, maintained on session save."""
+
+    __tablename__ = "personal_records"
+    client_id = Column(
+        Integer,
+        ForeignKey("clients.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    exercise_id = Column(
+        Integer,
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    metric = Column(String(10), primary_key=True)
+    value = Column(Numeric(10, 2), nullable=False)
+    # Session holding the record - records are recomputed when it changes
+    session_id = Column(
+        Integer,
+        ForeignKey("sessions.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    achieved_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        CheckConstraint(
+            "metric IN ({})".format(
+                ", ".join(f"'{m.value}'" for m in RecordMetric)
+            ),
+            name="ck_personal_record_metric_valid"
+        ),
+    )
+
+    exercise = relationship("Exercise")
+
+
+class WorkoutTemplate(db.Model):
+    """Named, reusable workout - independent of the session it was saved from."""
+
+    __tablename__ = "workout_templates"
+    id = Column(Integer, primary_key=True)
+    trainer_id = Column(
+        Integer,
+        ForeignKey("trainers.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    name = Column(String(100), nullable=False)
+    duration_min = Column(Integer, nullable=False, default=60, server_default="60")
+    notes = Column(Text)
+
+    template_exercises = relationship(
+        "WorkoutTemplateExercise",
+        back_populates="template",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="WorkoutTemplateExercise.position"
+    )
+    template_tags = relationship(
+        "WorkoutTemplateTag",
+        back_populates="template",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    __table_args__ = (
+        UniqueConstraint('trainer_id', 'name', name='uq_template_name_per_trainer'),
+        CheckConstraint("duration_min > 0", name="ck_template_duration_positive"),
+    )
+
+
+class WorkoutTemplateExercise(db.Model):
+    """One prescribed exercise of a template, in display order."""
+
+    __tablename__ = "workout_template_exercises"
+    id = Column(Integer, primary_key=True)
+    template_id = Column(
+        Integer,
+        ForeignKey("workout_templates.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    exercise_id = Column(
+        Integer,
+        ForeignKey("exercises.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True
+    )
+    position = Column(Integer, nullable=False)
+
+    sets = Column(Integer, nullable=False)
+    reps = Column(Integer, nullable=True)
+    time_seconds = Column(Integer, nullable=True)
+    weight = Column(Numeric(5, 2), nullable=False, default=0, server_default=text("0"))
+
+    # Same rules as session_exercises, so applying a template never fails
+    __table_args__ = (
+        CheckConstraint("sets > 0", name="ck_template_exercise_sets_positive"),
+        CheckConstraint("reps IS NULL OR reps > 0", name="ck_template_exercise_reps_positive"),
+        CheckConstraint("weight >= 0", name="ck_template_exercise_weight_nonnegative"),
+        CheckConstraint("time_seconds IS NULL OR time_seconds > 0", name="ck_template_exercise_time_positive"),
+        CheckConstraint(
+            "num_nonnulls(reps, time_seconds) = 1",
+            name="ck_template_exercise_one_metric_required"
+        ),
+    )
+
+    template = relationship("WorkoutTemplate", back_populates="template_exercises")
+    exercise = relationship("Exercise")
+
+
+class WorkoutTemplateTag(db.Model):
+    """Default tag of a template (many-to-many)."""
+
+    __tablename__ = "workout_template_tags"
+    template_id = Column(
+        Integer,
+        ForeignKey("workout_templates.id", ondelete="CASCADE"),
+        nullable=False,
+        primary_key=True
+    )
+    tag_id = Column(
+        Integer,
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        nullable=False,
+        primary_key=True
+    )
+
+    template = relationship("WorkoutTemplate", back_populates="template_tags")
+    tag = relationship("Tag")
+
+
+class IdempotencyKey(db.Model):
+    """Outcome of a mutating request, replayed when the same key is retried."""
+
+    __tablename__ = "idempotency_keys"
+    trainer_id = Column(
+        Integer,
+        ForeignKey("trainers.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    key = Column(String(64), primary_key=True)
+    endpoint = Column(String(100), nullable=False)
+    # Inserted in the view's own commit (see app/idempotency.py); NULL until
+    # the response is recorded, and a retry then gets a generic reply
+    status_code = Column(Integer, nullable=True)
+    location = Column(Text, nullable=True)  # redirect target
+    body = Column(Text, nullable=True)  # HTMX fragment
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        index=True
+    )
+
+
+class SyncTombstone(db.Model):
+    """A deleted synced row, written by the sync_tombstone trigger."""
+
+    __tablename__ = "sync_tombstones"
+    seq = Column(BigInteger, primary_key=True, server_default=change_sequence.next_value())
+    # No FK - tombstones outlive their trainer until purged
+    trainer_id = Column(Integer, nullable=False)
+    table_name = Column(String(32), nullable=False)
+    row_key = Column(String(32), nullable=False)  # public_id or id
+    deleted_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.clock_timestamp(),
+        index=True
+    )
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_trainer_seq", "trainer_id", "seq"),
+    )
+
+
+class ApiToken(db.Model):
+    """Bearer token for the JSON API. Only its SHA-256 digest is stored."""
+
+    __tablename__ = "api_tokens"
+    id = Column(Integer, primary_key=True)
+    trainer_id = Column(
+        Integer,
+        ForeignKey("trainers.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    name = Column(String(50), nullable=False)
+    token_hash = Column(String(64), nullable=False, unique=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint('trainer_id', 'name', name='uq_api_token_name_per_trainer'),
+    )
+
+
+class RequestProfile(db.Model):
+    """A profiled request: cProfile stats and its SQL (see app/profiling.py)."""
+
+    __tablename__ = "request_profiles"
+    id = Column(Integer, primary_key=True)
+    trainer_id = Column(
+        Integer,
+        ForeignKey("trainers.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    method = Column(String(10), nullable=False)
+    path = Column(Text, nullable=False)
+    endpoint = Column(String(100), nullable=True)
+    status_code = Column(Integer, nullable=False)
+    duration_ms = Column(Integer, nullable=False)
+    sql_ms = Column(Integer, nullable=False)
+    stats = Column(LargeBinary, nullable=False)  # marshalled pstats data
+    queries = Column(JSON, nullable=False)  # [{"sql", "ms", "executemany"}, ...]
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        index=True
+    )
@@ -0,0 +1,201 @@
+"""
+On-demand profiling of single requests, for "this page is slow for me"
+reports that don't reproduce on other data.
+
+An admin creates a token for the trainer (`flask create-profile-token`).
+Requests of that trainer carrying it in the X-Profile header or the
+_profile query argument run under cProfile with every SQL statement
+timed, and are stored as a RequestProfile; the response names it in
+X-Profile-Id and `flask export-profile` writes it out for pstats or
+snakeviz.
+
+Nothing is registered unless PROFILING_ENABLED is set. One request per
+worker is profiled at a time: cProfile is process-wide since Python
+3.12, so calls from other request threads can show up in the stats.
+"""
+import cProfile
+import marshal
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from flask import current_app, g, has_request_context, request
+from flask_login import current_user
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models import RequestProfile
+from app.constants import PROFILE_TOKEN_MAX_AGE_HOURS, PROFILE_TTL_DAYS
+
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ARG = "_profile"
+
+_busy = threading.Lock()
+
+
+def init_profiling(app):
+    if not app.config.get("PROFILING_ENABLED"):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_abandon_profile)
+
+
+def create_token(trainer_id: int) -> str:
+    return _serializer().dumps(trainer_id)
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.secret_key, salt="request-profile")
+
+
+def _token_trainer_id(token: str):
+    try:
+        return _serializer().loads(
+            token, max_age=PROFILE_TOKEN_MAX_AGE_HOURS * 3600
+        )
+    except BadSignature:
+        return None
+
+
+def _start_profile():
+    token = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_ARG)
+    if not token:
+        return
+    # Tokens are per trainer, so a leaked one can't profile anyone else
+    trainer_id = _token_trainer_id(token)
+    if (
+        trainer_id is None
+        or not current_user.is_authenticated
+        or current_user.id != trainer_id
+    ):
+        current_app.logger.warning("Ignored profile token for %s", request.path)
+        return
+    if not _busy.acquire(blocking=False):
+        current_app.logger.info("Profiler busy, not profiling %s", request.path)
+        return
+
+    profiler = cProfile.Profile()
+    g.profile = {"profiler": profiler, "queries": [], "started": time.perf_counter()}
+    profiler.enable()
+
+
+def _finish_profile(response):
+    profile = g.get("profile")
+    if profile is None:
+        return response
+    details = {
+        "trainer_id": current_user.id,
+        "method": request.method,
+        "path": _stored_path(),
+        "endpoint": request.endpoint,
+        "status_code": response.status_code,
+    }
+    if not response.is_streamed:
+        g.pop("profile")
+        profile_id = _complete(profile, details)
+        if profile_id is not None:
+            response.headers["X-Profile-Id"] = str(profile_id)
+        return response
+
+    # Streamed pages render while the body is sent - keep profiling until
+    # it is closed, under an id reserved now for the header
+    profile["streaming"] = True
+    try:
+        details["id"] = _reserve_id()
+    except SQLAlchemyError:
+        current_app.logger.exception("Could not reserve a profile id")
+    else:
+        response.headers["X-Profile-Id"] = str(details["id"])
+    app = current_app._get_current_object()
+
+    def finish():
+        with app.app_context():
+            _complete(profile, details)
+    response.call_on_close(finish)
+    return response
+
+
+def _stored_path() -> str:
+    # The token is a credential - keep it out of stored profiles
+    args = [
+        (name, value) for name, value in request.args.items(multi=True)
+        if name != PROFILE_ARG
+    ]
+    return request.path + (f"?{urlencode(args)}" if args else "")
+
+
+def _complete(profile: dict, details: dict):
+    """Stop the profiler and store the profile; returns its id or None."""
+    duration = time.perf_counter() - profile["started"]
+    profiler = profile["profiler"]
+    try:
+        profiler.create_stats()
+    finally:
+        _busy.release()
+    try:
+        return _save(details, duration, profiler.stats, profile["queries"])
+    except SQLAlchemyError:
+        current_app.logger.exception("Could not store profile of %s", details["path"])
+        return None
+
+
+def _reserve_id() -> int:
+    with db.engine.begin() as connection:
+        return connection.execute(
+            select(func.nextval(func.pg_get_serial_sequence("request_profiles", "id")))
+        ).scalar_one()
+
+
+def _save(details: dict, duration: float, stats: dict, queries: list) -> int:
+    # Own connection and transaction - the view's session is left alone
+    with db.engine.begin() as connection:
+        connection.execute(
+            delete(RequestProfile).where(
+                RequestProfile.created_at < func.now() - timedelta(days=PROFILE_TTL_DAYS)
+            )
+        )
+        return connection.execute(
+            insert(RequestProfile).values(
+                **details,
+                duration_ms=round(duration * 1000),
+                sql_ms=round(sum(q["ms"] for q in queries)),
+                stats=marshal.dumps(stats),
+                queries=queries,
+            ).returning(RequestProfile.id)
+        ).scalar_one()
+
+
+def _abandon_profile(exc):
+    # after_request did not run - stop without saving. Streamed profiles
+    # are finished when the response is closed.
+    profile = g.get("profile")
+    if profile is not None and not profile.get("streaming"):
+        g.pop("profile")
+        profile["profiler"].disable()
+        _busy.release()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and "profile" in g:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not (has_request_context() and "profile" in g):
+        return
+    started = conn.info.get("profile_started")
+    if not started:
+        return
+    g.profile["queries"].append({
+        "sql": statement,
+        "ms": round((time.perf_counter() - started.pop()) * 1000, 2),
+        "executemany": executemany,
+    })
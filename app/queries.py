@@ -0,0 +1,149 @@
+"""Reusable query builders shared by routes."""
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import DateTime, Integer, case, func, literal, or_, select
+from sqlalchemy.orm import contains_eager
+
+from app.models import Client, Session, SessionTag
+
+
+SESSION_STATUSES = ("planned", "done", "cancelled", "no_show")
+UNPAID_STATUSES = ("done", "no_show")
+# The only status that frees a session's time slot - overlap checks and
+# free slots ignore it, and ix_sessions_time_range is partial on it
+FREE_SLOT_STATUS = "cancelled"
+
+
+def trainer_sessions(trainer_id: int, include_archived: bool = False):
+    """Base select of a trainer's sessions, joined with their clients."""
+    stmt = (
+        select(Session)
+        .join(Session.client)
+        .where(Client.trainer_id == trainer_id)
+    )
+    if not include_archived:
+        stmt = stmt.where(Client.archived_at.is_(None))
+    return stmt
+
+
+def parse_session_filters(args) -> dict:
+    """
+    Read session filters from request args.
+    Invalid values are dropped, so the result is safe to put back into URLs.
+    """
+    filters = {
+        "client": args.get("client", "").strip(),
+        "status": args.get("status", ""),
+        "tag": args.get("tag", type=int),
+        "paid": args.get("paid", ""),
+        "date_from": args.get("date_from", ""),
+        "date_to": args.get("date_to", ""),
+    }
+    if filters["status"] not in SESSION_STATUSES:
+        filters["status"] = ""
+    if filters["paid"] not in ("1", "0"):
+        filters["paid"] = ""
+    for key in ("date_from", "date_to"):
+        if not _is_date(filters[key]):
+            filters[key] = ""
+    return filters
+
+
+def filter_sessions(stmt, filters: dict, tz_name: str):
+    """
+    Apply parsed session filters to a select over Session.
+    The client filter expects Client to be joined (see trainer_sessions).
+    """
+    if filters.get("client"):
+        stmt = stmt.where(Client.public_id == filters["client"])
+    if filters.get("status"):
+        stmt = stmt.where(Session.status == filters["status"])
+    if filters.get("tag"):
+        # Served by ix_session_tags_tag_session
+        stmt = stmt.where(Session.id.in_(
+            select(SessionTag.session_id)
+            .where(SessionTag.tag_id == filters["tag"])
+        ))
+    if filters.get("paid") == "1":
+        stmt = stmt.where(Session.is_paid.is_(True))
+    elif filters.get("paid") == "0":
+        stmt = stmt.where(Session.is_paid.is_(False))
+
+    tz = ZoneInfo(tz_name)
+    if filters.get("date_from"):
+        stmt = stmt.where(Session.start_dt >= _local_date_to_utc(filters["date_from"], tz))
+    if filters.get("date_to"):
+        date_to = _local_date_to_utc(filters["date_to"], tz) + timedelta(days=1)
+        stmt = stmt.where(Session.start_dt < date_to)
+    return stmt
+
+
+def with_session_totals(stmt):
+    """
+    Add count, price sum and unpaid sum over the whole filtered set as
+    window columns, so totals arrive in the same round trip as the rows.
+    """
+    unpaid_price = case(
+        (
+            Session.status.in_(UNPAID_STATUSES) & Session.is_paid.is_(False),
+            Session.price
+        ),
+        else_=0
+    )
+    return stmt.add_columns(
+        func.count().over().label("total_count"),
+        func.coalesce(func.sum(Session.price).over(), 0).label("total_price"),
+        func.coalesce(func.sum(unpaid_price).over(), 0).label("unpaid_price"),
+    )
+
+
+def session_range(start_dt, duration_min):
+    """
+    Time span of a session as a tstzrange. Must stay the exact expression
+    of ix_sessions_time_range for the GiST index to be used.
+    """
+    return func.session_range(start_dt, duration_min)
+
+
+def overlapping_sessions(trainer_id: int, start_dt: datetime, duration_min: int,
+                         exclude_session_id: int = None, exclude_group_id: str = None):
+    """
+    Non-cancelled sessions of a trainer that overlap the given slot.
+    Sessions of the same group share the slot on purpose and are skipped.
+    """
+    slot = session_range(
+        literal(start_dt, DateTime(timezone=True)),
+        literal(duration_min, Integer)
+    )
+    stmt = (
+        trainer_sessions(trainer_id, include_archived=True)
+        .options(contains_eager(Session.client))
+        .where(
+            Session.status != FREE_SLOT_STATUS,
+            session_range(Session.start_dt, Session.duration_min).op("&&")(slot)
+        )
+        .order_by(Session.start_dt)
+    )
+    if exclude_session_id is not None:
+        stmt = stmt.where(Session.id != exclude_session_id)
+    if exclude_group_id is not None:
+        stmt = stmt.where(or_(
+            Session.group_id.is_(None),
+            Session.group_id != exclude_group_id
+        ))
+    return stmt
+
+
+def _is_date(value: str) -> bool:
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
+
+def _local_date_to_utc(value: str, tz: ZoneInfo) -> datetime:
+    """YYYY-MM-DD as local midnight, converted to UTC."""
+    local_dt = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=tz)
+    return local_dt.astimezone(timezone.utc)
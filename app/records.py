@@ -0,0 +1,124 @@
+"""Incremental maintenance of personal records (see PersonalRecord)."""
+from sqlalchemy import and_, case, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app import db
+from app.models import PersonalRecord, RecordMetric, Session, SessionExercise
+
+
+def _metric_value(metric: RecordMetric):
+    """SQL value of a metric for one session_exercises row and the rows it applies to."""
+    se = SessionExercise
+    lifted = and_(se.reps.isnot(None), se.weight > 0)
+    if metric == RecordMetric.WEIGHT:
+        return se.weight, lifted
+    if metric == RecordMetric.E1RM:
+        e1rm = case(
+            (se.reps == 1, se.weight),
+            else_=se.weight * (1 + se.reps / 30.0)
+        )
+        return e1rm, lifted
+    if metric == RecordMetric.VOLUME:
+        return se.sets * se.reps * se.weight, lifted
+    return se.time_seconds, se.time_seconds.isnot(None)
+
+
+def _upsert(select_stmt):
+    """Insert candidate records, keeping the existing one unless beaten."""
+    stmt = insert(PersonalRecord).from_select(
+        ["client_id", "exercise_id", "metric", "value", "session_id", "achieved_at"],
+        select_stmt
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["client_id", "exercise_id", "metric"],
+        set_={
+            "value": stmt.excluded.value,
+            "session_id": stmt.excluded.session_id,
+            "achieved_at": stmt.excluded.achieved_at,
+        },
+        where=PersonalRecord.value < stmt.excluded.value
+    )
+    db.session.execute(stmt)
+
+
+def _recompute(client_id: int, exercise_id: int, metric: RecordMetric,
+               exclude_session_id: int = None):
+    """Find the best remaining result for one record key (index-served)."""
+    se = SessionExercise
+    value, applies = _metric_value(metric)
+    stmt = (
+        select(
+            se.client_id,
+            se.exercise_id,
+            literal(metric.value),
+            value,
+            Session.id,
+            Session.start_dt,
+        )
+        .join(Session, Session.id == se.session_id)
+        .where(
+            se.client_id == client_id,
+            se.exercise_id == exercise_id,
+            Session.status == "done",
+            applies,
+        )
+        .order_by(value.desc(), Session.start_dt)
+        .limit(1)
+    )
+    if exclude_session_id is not None:
+        stmt = stmt.where(Session.id != exclude_session_id)
+    _upsert(stmt)
+
+
+def refresh_personal_records(session_obj: Session, removed: bool = False):
+    """
+    Bring records in line with a changed session. Call after pending
+    exercise rows are flushed and before commit; pass removed=True right
+    before deleting the session.
+
+    Only keys this session holds are recomputed from history; everything
+    else is an upsert of this session's own rows.
+    """
+    held = db.session.execute(
+        delete(PersonalRecord)
+        .where(PersonalRecord.session_id == session_obj.id)
+        .returning(
+            PersonalRecord.client_id,
+            PersonalRecord.exercise_id,
+            PersonalRecord.metric,
+        )
+    ).all()
+    exclude = session_obj.id if removed else None
+    for client_id, exercise_id, metric in held:
+        _recompute(client_id, exercise_id, RecordMetric(metric), exclude)
+
+    if removed or session_obj.status != "done":
+        return
+
+    se = SessionExercise
+    for metric in RecordMetric:
+        value, applies = _metric_value(metric)
+        _upsert(
+            select(
+                se.client_id,
+                se.exercise_id,
+                literal(metric.value),
+                func.max(value),
+                literal(session_obj.id),
+                literal(session_obj.start_dt),
+            )
+            .where(se.session_id == session_obj.id, applies)
+            .group_by(se.client_id, se.exercise_id)
+        )
+
+
+def session_record_metrics(session_id: int) -> dict:
+    """{exercise_id (str): [metric, ...]} of records held by a session."""
+    rows = db.session.execute(
+        select(PersonalRecord.exercise_id, PersonalRecord.metric)
+        .where(PersonalRecord.session_id == session_id)
+    ).all()
+    result = {}
+    for exercise_id, metric in rows:
+        result.setdefault(str(exercise_id), []).append(metric)
+    return result
@@ -2,4 +2,4 @@ from flask import Blueprint
 
 bp = Blueprint("main", __name__)
 
-from . import user, sessions, exercises, clients, tags, references, static_routes  # noqa: F401,E402
+from . import user, sessions, exercises, clients, tags, references, progress, workout_templates, live, sync, static_routes  # noqa: F401,E402
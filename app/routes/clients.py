@@ -1,12 +1,26 @@
 from datetime import datetime, timezone
 from flask import abort, render_template, redirect, request, url_for, flash
 from flask_login import login_required, current_user
-from sqlalchemy import exists, func, select
+from sqlalchemy import exists, func, select, tuple_
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
-from app import db
-from app.models import Client, Session
+from app import db, limiter
+from app.models import Client, Exercise, PersonalRecord, Session, SessionTag, Tag
 from app.forms import AddClientForm
+from app.queries import filter_sessions, parse_session_filters
+from app.utils import (
+    edit_conflicts, is_stale, stream_page, stream_rows, submitted_version,
+)
+from app.idempotency import DuplicateRequest, idempotent
+from app.constants import (
+    CLIENT_UPCOMING_LIMIT,
+    CLIENT_RECENT_LIMIT,
+    CLIENT_UNPAID_LIMIT,
+    CLIENT_HISTORY_PAGE_SIZE,
+    CLIENT_SECTIONS_RATE_LIMIT,
+)
 
 from . import bp
 
@@ -14,11 +28,81 @@ from . import bp
 @bp.route("/clients", methods=["GET"])
 @login_required
 def clients():
-    stmt = select(Client).where(
-        Client.trainer_id == current_user.id,
-        Client.archived_at == None)
-    clients = db.session.execute(stmt).scalars().all()
-    return render_template("clients/clients.html", clients=clients)
+    now = datetime.now(timezone.utc)
+
+    # All per-client summaries come from one grouped query over sessions
+    last_dt = func.max(Session.start_dt).filter(
+        Session.start_dt < now
+    ).label("last_session_dt")
+    next_dt = func.min(Session.start_dt).filter(
+        Session.status == "planned",
+        Session.start_dt >= now
+    ).label("next_session_dt")
+    unpaid_count = func.count(Session.id).filter(
+        Session.status.in_(("done", "no_show")),
+        Session.is_paid.is_(False)
+    ).label("unpaid_count")
+    total_count = func.count(Session.id).label("total_count")
+
+    sort_columns = {
+        "name": Client.name,
+        "price": Client.price,
+        "last": last_dt,
+        "next": next_dt,
+        "unpaid": unpaid_count,
+        "total": total_count,
+    }
+    sort = request.args.get("sort", "name")
+    if sort not in sort_columns:
+        sort = "name"
+    order = "desc" if request.args.get("order") == "desc" else "asc"
+    status = request.args.get("status", "")
+    if status not in ("active", "pause"):
+        status = ""
+    only_unpaid = request.args.get("unpaid") == "1"
+    only_unplanned = request.args.get("unplanned") == "1"
+
+    stmt = (
+        select(Client, last_dt, next_dt, unpaid_count, total_count)
+        .outerjoin(Session, Session.client_id == Client.id)
+        .where(
+            Client.trainer_id == current_user.id,
+            Client.archived_at.is_(None)
+        )
+        .group_by(Client.id)
+    )
+    if status:
+        stmt = stmt.where(Client.status == status)
+    if only_unpaid:
+        stmt = stmt.having(unpaid_count > 0)
+    if only_unplanned:
+        stmt = stmt.having(next_dt.is_(None))
+
+    sort_col = sort_columns[sort]
+    sort_col = sort_col.desc() if order == "desc" else sort_col.asc()
+    stmt = stmt.order_by(sort_col.nulls_last(), Client.name)
+
+    rows = db.session.execute(stmt).all()
+    clients = []
+    for client, last_session_dt, next_session_dt, unpaid, total in rows:
+        client.last_session_dt = last_session_dt
+        client.next_session_dt = next_session_dt
+        client.unpaid_count = unpaid
+        client.total_count = total
+        clients.append(client)
+
+    filters = {
+        "status": status,
+        "unpaid": only_unpaid,
+        "unplanned": only_unplanned,
+    }
+    return render_template(
+        "clients/clients.html",
+        clients=clients,
+        sort=sort,
+        order=order,
+        filters=filters,
+    )
 
 
 @bp.route("/clients/archive", methods=["GET"])
@@ -37,16 +121,17 @@ def archived_clients():
         .order_by(Client.name)
     )
 
-    rows = db.session.execute(stmt).all()
-    clients = []
-    for client, last_session_dt in rows:
-        client.last_session_dt = last_session_dt
-        clients.append(client)
-    return render_template("clients/archived_clients.html", clients=clients)
+    first, rows = stream_rows(stmt)
+    return stream_page(
+        "clients/archived_clients.html",
+        clients=_with_last_session(rows),
+        has_clients=first is not None,
+    )
 
 
 @bp.route("/clients/add", methods=["GET", "POST"])
 @login_required
+@idempotent
 def add_client():
     form = AddClientForm()
     if form.validate_on_submit():
@@ -83,6 +168,7 @@ def add_client():
 
 @bp.route("/clients/<string:client_public_id>", methods=["GET", "POST"])
 @login_required
+@idempotent
 def client(client_public_id):
     stmt = select(Client).where(
         Client.public_id == client_public_id,
@@ -96,38 +182,218 @@ def client(client_public_id):
     if request.method == "POST" and client.archived_at:
         abort(403)
 
-    stmt = (
-        select(Session)
-        .where(
-            Session.client.has(trainer_id=current_user.id),
-            Session.client.has(id=client.id)
-        )
-        .order_by(Session.start_dt.desc())
-    )
-    sessions = db.session.execute(stmt).scalars().all()
-
+    # Sessions are not loaded here - the card lazy-loads them by section
     form = AddClientForm(obj=client)
-    if form.validate_on_submit():
+    edit_conflict = None
+    if request.method == "POST" and is_stale(client):
+        edit_conflict = _client_edit_conflict(client, form)
+        flash("This client was changed elsewhere. Review the differences and save again.", "warning")
+    elif form.validate_on_submit():
         form.populate_obj(client)
         try:
             db.session.commit()
             flash("Client updated successfully", "success")
+            return redirect(url_for(".client", client_public_id=client.public_id))
+        except StaleDataError:
+            # Rollback expires client, so the comparison sees the saved row
+            db.session.rollback()
+            edit_conflict = _client_edit_conflict(client, form)
+            flash("This client was changed elsewhere. Review the differences and save again.", "warning")
+        except DuplicateRequest:
+            raise
         except Exception:
             db.session.rollback()
             flash("Error updating client. Please try again.", "danger")
-            return render_template("clients/client.html", client=client, form=form, sessions=sessions)
+            return render_template("clients/client.html", client=client, form=form)
 
-        return redirect(url_for(".client", client_public_id=client.public_id))
+    # Re-rendered invalid forms keep the version they were loaded with
+    form_version = client.version_id
+    if edit_conflict is None and request.method == "POST":
+        form_version = submitted_version() or form_version
 
     return render_template(
         "clients/client.html",
         client=client,
         form=form,
-        sessions=sessions
+        form_version=form_version,
+        edit_conflict=edit_conflict,
+    ), 409 if edit_conflict is not None else 200
+
+
+@bp.route("/clients/<string:client_public_id>/sessions/<string:section>", methods=["GET"])
+@limiter.limit(CLIENT_SECTIONS_RATE_LIMIT)
+@login_required
+def client_sessions(client_public_id, section):
+    """One section of the client card: upcoming, recent, unpaid or history (HTMX request)."""
+    if not request.headers.get("HX-Request"):
+        abort(404)
+    if section not in ("upcoming", "recent", "unpaid", "history"):
+        abort(404)
+
+    client = db.session.execute(
+        select(Client.id, Client.public_id).where(
+            Client.public_id == client_public_id,
+            Client.trainer_id == current_user.id
+        )
+    ).first()
+    if not client:
+        abort(404)
+
+    stmt = (
+        select(Session)
+        .where(Session.client_id == client.id)
+        .options(
+            selectinload(Session.session_tags).selectinload(SessionTag.tag)
+        )
+    )
+    now = datetime.now(timezone.utc)
+
+    if section == "upcoming":
+        stmt = stmt.where(
+            Session.status == "planned",
+            Session.start_dt >= now
+        ).order_by(Session.start_dt).limit(CLIENT_UPCOMING_LIMIT)
+    elif section == "recent":
+        stmt = stmt.where(
+            Session.start_dt < now
+        ).order_by(Session.start_dt.desc()).limit(CLIENT_RECENT_LIMIT)
+    elif section == "unpaid":
+        stmt = stmt.where(
+            Session.status.in_(("done", "no_show")),
+            Session.is_paid.is_(False)
+        ).order_by(Session.start_dt.desc()).limit(CLIENT_UNPAID_LIMIT + 1)
+    else:
+        return _client_history(client, stmt)
+
+    sessions = db.session.execute(stmt).scalars().all()
+    # Only unpaid can hit its limit with more rows left - say so
+    has_more = section == "unpaid" and len(sessions) > CLIENT_UNPAID_LIMIT
+    return render_template(
+        "clients/_client_section.html",
+        section=section,
+        sessions=sessions[:CLIENT_UNPAID_LIMIT] if has_more else sessions,
+        has_more=has_more,
+        client_public_id=client.public_id,
+    )
+
+
+@bp.route("/clients/<string:client_public_id>/records", methods=["GET"])
+@login_required
+def client_records(client_public_id):
+    """Personal records of a client, read from the maintained table (HTMX request)."""
+    if not request.headers.get("HX-Request"):
+        abort(404)
+
+    client_id = db.session.scalar(
+        select(Client.id).where(
+            Client.public_id == client_public_id,
+            Client.trainer_id == current_user.id
+        )
+    )
+    if client_id is None:
+        abort(404)
+
+    rows = db.session.execute(
+        select(
+            Exercise.id,
+            Exercise.name,
+            PersonalRecord.metric,
+            PersonalRecord.value,
+            PersonalRecord.achieved_at,
+        )
+        .join(Exercise, Exercise.id == PersonalRecord.exercise_id)
+        .where(PersonalRecord.client_id == client_id)
+        .order_by(Exercise.name)
+    ).all()
+
+    # One row per exercise, one cell per metric
+    records = {}
+    for row in rows:
+        entry = records.setdefault(row.id, {"name": row.name, "metrics": {}})
+        entry["metrics"][row.metric] = row
+
+    return render_template(
+        "clients/_client_records.html",
+        records=list(records.values()),
+    )
+
+
+def _client_edit_conflict(client: Client, form: AddClientForm) -> list:
+    """Differences between a stale edit and the client as saved now."""
+    return edit_conflicts(form, {
+        "name": client.name,
+        "price": client.price,
+        "status": client.status,
+        "contact": client.contact,
+        "notes": client.notes,
+    })
+
+
+def _client_history(client, stmt):
+    """Keyset-paginated, filterable full history of a client's sessions."""
+    filters = parse_session_filters(request.args)
+    # The client is fixed by the URL
+    filters["client"] = ""
+    stmt = filter_sessions(
+        stmt, filters, current_user.timezone or "Europe/Kyiv"
+    )
+
+    # Keyset cursor: (start_dt, id) of the last row of the previous page
+    before_dt = request.args.get("before_dt", "")
+    before_id = request.args.get("before_id", type=int)
+    is_next_page = False
+    if before_dt and before_id:
+        try:
+            cursor_dt = datetime.fromisoformat(before_dt)
+        except ValueError:
+            abort(400)
+        stmt = stmt.where(
+            tuple_(Session.start_dt, Session.id) < tuple_(cursor_dt, before_id)
+        )
+        is_next_page = True
+
+    stmt = stmt.order_by(
+        Session.start_dt.desc(), Session.id.desc()
+    ).limit(CLIENT_HISTORY_PAGE_SIZE + 1)
+    sessions = db.session.execute(stmt).scalars().all()
+
+    next_url = None
+    if len(sessions) > CLIENT_HISTORY_PAGE_SIZE:
+        sessions = sessions[:CLIENT_HISTORY_PAGE_SIZE]
+        last = sessions[-1]
+        next_url = url_for(
+            ".client_sessions",
+            client_public_id=client.public_id,
+            section="history",
+            before_dt=last.start_dt.isoformat(),
+            before_id=last.id,
+            **{k: v for k, v in filters.items() if v}
+        )
+
+    if is_next_page:
+        return render_template(
+            "clients/_client_history_rows.html",
+            sessions=sessions,
+            next_url=next_url,
+        )
+
+    tags = db.session.execute(
+        select(Tag.id, Tag.name)
+        .where(Tag.trainer_id == current_user.id)
+        .order_by(Tag.name)
+    ).all()
+    return render_template(
+        "clients/_client_history.html",
+        client_public_id=client.public_id,
+        sessions=sessions,
+        next_url=next_url,
+        filters=filters,
+        tags=tags,
     )
 
 @bp.route("/clients/<string:client_public_id>/archive", methods=["POST"])
 @login_required
+@idempotent
 def archive_client(client_public_id):
     stmt = select(Client).where(
         Client.public_id == client_public_id,
@@ -156,6 +422,8 @@ def archive_client(client_public_id):
     try:
         db.session.commit()
         flash("Client archived successfully", "success")
+    except DuplicateRequest:
+        raise
     except Exception:
         db.session.rollback()
         flash("Error archiving client. Please try again.", "danger")
@@ -165,6 +433,7 @@ def archive_client(client_public_id):
 
 @bp.route("/clients/<string:client_public_id>/unarchive", methods=["POST"])
 @login_required
+@idempotent
 def unarchive_client(client_public_id):
     stmt = select(Client).where(
         Client.public_id == client_public_id,
@@ -180,6 +449,8 @@ def unarchive_client(client_public_id):
     try:
         db.session.commit()
         flash("Client unarchived successfully", "success")
+    except DuplicateRequest:
+        raise
     except Exception:
         db.session.rollback()
         flash("Error unarchiving client. Please try again.", "danger")
@@ -189,6 +460,7 @@ def unarchive_client(client_public_id):
 
 @bp.route("/clients/<string:client_public_id>/delete", methods=["POST"])
 @login_required
+@idempotent
 def delete_client(client_public_id):
     stmt = select(Client).where(
         Client.public_id == client_public_id,
@@ -216,8 +488,15 @@ def delete_client(client_public_id):
     try:
         db.session.commit()
         flash("Client deleted successfully", "success")
+    except DuplicateRequest:
+        raise
     except Exception:
         db.session.rollback()
         flash("Error deleting client. Please try again.", "danger")
 
-    return redirect(url_for(".clients"))
\ No newline at end of file
+    return redirect(url_for(".clients"))
+
+def _with_last_session(rows):
+    for client, last_session_dt in rows:
+        client.last_session_dt = last_session_dt
+        yield client
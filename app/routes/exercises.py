@@ -4,7 +4,7 @@ from sqlalchemy import exists, func, select
 from sqlalchemy.exc import IntegrityError
 
 from app import db
-from app.models import Exercise, SessionExercise
+from app.models import Exercise, SessionExercise, WorkoutTemplateExercise
 from app.forms import AddExerciseForm, EditExerciseForm
 
 from . import bp
@@ -209,6 +209,11 @@ def delete_exercise(exercise_id):
         flash("Exercise used in sessions cannot be deleted. Archive it instead.", "danger")
         return redirect(url_for(".exercise", exercise_id=exercise.id))
 
+    # Template rows reference exercises with ON DELETE RESTRICT
+    if _exercise_used_in_templates(exercise.id):
+        flash("Exercise used in workout templates cannot be deleted. Remove it from the templates or archive it instead.", "danger")
+        return redirect(url_for(".exercise", exercise_id=exercise.id))
+
     db.session.delete(exercise)
 
     try:
@@ -226,3 +231,10 @@ def _exercise_used_in_sessions(exercise_id: int) -> bool:
         exists().where(SessionExercise.exercise_id == exercise_id)
     )
     return bool(db.session.scalar(stmt))
+
+
+def _exercise_used_in_templates(exercise_id: int) -> bool:
+    stmt = select(
+        exists().where(WorkoutTemplateExercise.exercise_id == exercise_id)
+    )
+    return bool(db.session.scalar(stmt))
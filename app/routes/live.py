@@ -0,0 +1,127 @@
+from flask import abort, render_template, request
+from flask_login import login_required, current_user
+from nanoid import generate
+from sqlalchemy import String, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models import Client, Session, SessionExercise
+from app.constants import LIVE_LOG_KEYS_KEPT
+from app.records import refresh_personal_records
+from app.utils import bump_version
+
+from . import bp
+
+
+@bp.route("/sessions/<string:session_public_id>/live", methods=["GET"])
+@login_required
+def live_session(session_public_id):
+    """Phone-friendly page for logging sets one tap at a time."""
+    session_obj = db.session.execute(
+        select(Session)
+        .where(
+            Session.public_id == session_public_id,
+            Session.client.has(trainer_id=current_user.id)
+        )
+        .options(
+            selectinload(Session.client),
+            selectinload(Session.session_exercises)
+            .selectinload(SessionExercise.exercise),
+        )
+    ).scalars().first()
+    if not session_obj:
+        abort(404)
+    if session_obj.client.archived_at:
+        abort(403)
+
+    return render_template(
+        "sessions/live.html",
+        session=session_obj,
+        items=[(se, _new_log_key()) for se in session_obj.session_exercises],
+    )
+
+
+@bp.route(
+    "/sessions/<string:session_public_id>/exercises/<int:se_id>/log-set",
+    methods=["POST"]
+)
+@login_required
+def log_set(session_public_id, se_id):
+    """
+    Append one set to a single exercise row (HTMX request).
+
+    `expected_sets` is the count the client saw (optimistic check) and `key`
+    identifies this tap, so a retried request is answered without logging
+    the set twice. Responds 409 with the current row if it moved on.
+    """
+    if not request.headers.get("HX-Request"):
+        abort(404)
+    key = request.form.get("key", "")
+    expected_sets = request.form.get("expected_sets", type=int)
+    if not key or len(key) > 21 or expected_sets is None:
+        abort(400)
+
+    owned_session = (
+        select(Session.id)
+        .join(Session.client)
+        .where(
+            Session.public_id == session_public_id,
+            Client.trainer_id == current_user.id,
+            Client.archived_at.is_(None)
+        )
+        .scalar_subquery()
+    )
+    # Compare-and-set in one statement - no read before write
+    logged = db.session.execute(
+        update(SessionExercise)
+        .where(
+            SessionExercise.id == se_id,
+            SessionExercise.session_id == owned_session,
+            SessionExercise.sets == expected_sets,
+            ~SessionExercise.recent_log_keys.any(key)
+        )
+        .values(
+            sets=SessionExercise.sets + 1,
+            recent_log_keys=func.array_prepend(
+                key, SessionExercise.recent_log_keys, type_=ARRAY(String(21))
+            )[1:LIVE_LOG_KEYS_KEPT]
+        )
+        .returning(SessionExercise.session_id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+
+    if logged is not None:
+        # Volume records depend on the set count
+        session_obj = db.session.get(Session, logged)
+        # An edit form open elsewhere must not overwrite the logged set
+        bump_version(session_obj, "notes")
+        if session_obj.status == "done":
+            refresh_personal_records(session_obj)
+        db.session.commit()
+
+    se = db.session.execute(
+        select(SessionExercise)
+        .where(
+            SessionExercise.id == se_id,
+            SessionExercise.session_id == owned_session
+        )
+        .options(selectinload(SessionExercise.exercise))
+    ).scalars().first()
+    if not se:
+        abort(404)
+
+    # Not logged and not a replay of a recent tap: someone else changed the row
+    conflict = logged is None and key not in se.recent_log_keys
+    return render_template(
+        "helpers/_live_set.html",
+        session_public_id=session_public_id,
+        se=se,
+        log_key=_new_log_key(),
+        conflict=conflict,
+    ), 409 if conflict else 200
+
+
+def _new_log_key() -> str:
+    """Key for the next tap; rendered into the button so retries reuse it."""
+    return generate(size=21)
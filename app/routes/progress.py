@@ -0,0 +1,119 @@
+from flask import abort, jsonify, request
+from flask_login import login_required, current_user
+from sqlalchemy import case, func, select
+
+from app import db
+from app.models import Client, Exercise, ExerciseType, Session, SessionExercise
+from app.constants import PROGRESS_DEFAULT_POINTS, PROGRESS_MAX_POINTS
+
+from . import bp
+
+
+@bp.route(
+    "/clients/<string:client_public_id>/progress/<int:exercise_id>",
+    methods=["GET"]
+)
+@login_required
+def exercise_progress(client_public_id, exercise_id):
+    """
+    Chart data for a client's progress on one exercise, as column arrays.
+    Long histories are downsampled in SQL into at most `points` buckets.
+    """
+    client_id = db.session.scalar(
+        select(Client.id).where(
+            Client.public_id == client_public_id,
+            Client.trainer_id == current_user.id
+        )
+    )
+    exercise = db.session.execute(
+        select(Exercise.id, Exercise.name, Exercise.type).where(
+            Exercise.id == exercise_id,
+            Exercise.trainer_id == current_user.id
+        )
+    ).first()
+    if client_id is None or not exercise:
+        abort(404)
+
+    max_points = request.args.get("points", PROGRESS_DEFAULT_POINTS, type=int)
+    max_points = min(max(max_points, 2), PROGRESS_MAX_POINTS)
+
+    se = SessionExercise
+    reps = func.coalesce(se.reps, 0)
+    # Epley estimate; a single rep is the 1RM itself
+    e1rm = case(
+        (se.reps == 1, se.weight),
+        else_=se.weight * (1 + reps / 30.0)
+    )
+
+    # One row per done session - the (client_id, exercise_id) predicate is
+    # served by ix_se_client_exercise
+    per_session = (
+        select(
+            Session.start_dt.label("start_dt"),
+            func.sum(se.sets * reps * se.weight).label("volume"),
+            func.max(se.weight).label("best_weight"),
+            func.max(e1rm).label("e1rm"),
+            func.sum(se.sets * func.coalesce(se.time_seconds, 0)).label("tul"),
+        )
+        .join(Session, Session.id == se.session_id)
+        .where(
+            se.client_id == client_id,
+            se.exercise_id == exercise.id,
+            Session.status == "done"
+        )
+        .group_by(Session.id, Session.start_dt)
+        .subquery()
+    )
+
+    windowed = select(
+        per_session,
+        func.max(per_session.c.e1rm).over(
+            order_by=per_session.c.start_dt,
+            rows=(None, 0)
+        ).label("best_e1rm"),
+        func.ntile(max_points).over(
+            order_by=per_session.c.start_dt
+        ).label("bucket"),
+    ).subquery()
+
+    # When there are fewer sessions than points, every bucket holds one row
+    buckets = db.session.execute(
+        select(
+            func.min(windowed.c.start_dt).label("start_dt"),
+            func.avg(windowed.c.volume).label("volume"),
+            func.max(windowed.c.best_weight).label("best_weight"),
+            func.max(windowed.c.e1rm).label("e1rm"),
+            func.max(windowed.c.best_e1rm).label("best_e1rm"),
+            func.avg(windowed.c.tul).label("tul"),
+            func.count().label("sessions"),
+        )
+        .group_by(windowed.c.bucket)
+        .order_by(windowed.c.bucket)
+    ).all()
+
+    series = {"t": [b.start_dt.isoformat() for b in buckets]}
+    if exercise.type == ExerciseType.TIME.value:
+        series["tul"] = [_num(b.tul) for b in buckets]
+    else:
+        series["volume"] = [_num(b.volume) for b in buckets]
+        series["best_weight"] = [_num(b.best_weight) for b in buckets]
+        series["e1rm"] = [_num(b.e1rm) for b in buckets]
+        series["best_e1rm"] = [_num(b.best_e1rm) for b in buckets]
+
+    total = sum(b.sessions for b in buckets)
+    response = jsonify(
+        exercise={
+            "id": exercise.id,
+            "name": exercise.name,
+            "type": exercise.type,
+        },
+        sessions=total,
+        downsampled=total > len(buckets),
+        series=series,
+    )
+    response.headers["Cache-Control"] = "private, max-age=60"
+    return response
+
+
+def _num(value):
+    return round(float(value), 1) if value is not None else None
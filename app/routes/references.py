@@ -4,6 +4,7 @@ from sqlalchemy import select
 
 from app import db
 from app.models import Exercise, Tag
+from app.workout_templates import trainer_templates
 
 from . import bp
 
@@ -12,7 +13,7 @@ from . import bp
 @bp.route("/references/<tab>")
 @login_required
 def references(tab="exercises"):
-    if tab not in ("exercises", "tags"):
+    if tab not in ("exercises", "tags", "templates"):
         tab = "exercises"
 
     stmt_exercises = select(Exercise).where(
@@ -30,5 +31,6 @@ def references(tab="exercises"):
         "references/references.html",
         exercises=exercises,
         tags=tags,
+        templates=trainer_templates(current_user.id),
         active_tab=tab,
     )
@@ -3,10 +3,13 @@ from flask import (
     url_for, flash, abort,
 )
 from flask_login import login_required, current_user
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from opentelemetry import trace
+from sqlalchemy import insert, select
+from sqlalchemy.orm import contains_eager, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.exc import IntegrityError
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
 from zoneinfo import ZoneInfo
 
 from app import db
@@ -17,33 +20,102 @@ from app.models import (
 )
 from app.forms import (
     AddSessionForm, SessionExercisesHelperForm,
-    EditSessionForm
+    EditSessionForm, GroupSessionForm,
+)
+from app.queries import (
+    FREE_SLOT_STATUS, filter_sessions, overlapping_sessions,
+    parse_session_filters, trainer_sessions, with_session_totals,
+)
+from app.records import refresh_personal_records, session_record_metrics
+from app.idempotency import DuplicateRequest, idempotent
+from app.scheduling import find_free_slots
+from app.workout_templates import trainer_templates
+from app.utils import (
+    bump_version, edit_conflicts, generate_session_public_ids,
+    is_stale, stream_page, stream_rows, submitted_version,
+)
+from app.constants import (
+    GROUP_SESSION_MAX_CLIENTS,
+    FREE_SLOTS_WORK_START,
+    FREE_SLOTS_WORK_END,
+    FREE_SLOTS_DEFAULT_DAYS,
+    FREE_SLOTS_MAX_DAYS,
 )
 
 from . import bp
 
+tracer = trace.get_tracer(__name__)
+
 
 @bp.route("/sessions", methods=["GET", "POST"])
 @login_required
 def sessions():
+    filters = parse_session_filters(request.args)
+    stmt = filter_sessions(
+        trainer_sessions(current_user.id),
+        filters,
+        _trainer_tz()
+    )
     stmt = (
-        select(Session)
-        .join(Session.client)
+        with_session_totals(stmt)
+        .options(
+            contains_eager(Session.client),
+            selectinload(Session.session_tags).selectinload(SessionTag.tag)
+        )
+        .order_by(Session.start_dt.desc())
+    )
+    # Streamed: totals are window columns, so the first row carries them
+    first, rows = stream_rows(stmt)
+    totals = {
+        "count": first.total_count if first else 0,
+        "price": first.total_price if first else 0,
+        "unpaid": first.unpaid_price if first else 0,
+    }
+
+    clients = db.session.execute(
+        select(Client.public_id, Client.name)
         .where(
             Client.trainer_id == current_user.id,
             Client.archived_at.is_(None)
         )
+        .order_by(Client.name)
+    ).all()
+    tags = db.session.execute(
+        select(Tag.id, Tag.name)
+        .where(Tag.trainer_id == current_user.id)
+        .order_by(Tag.name)
+    ).all()
+
+    return stream_page(
+        "sessions/sessions.html",
+        sessions=(row.Session for row in rows),
+        totals=totals,
+        filters=filters,
+        is_filtered=any(filters.values()),
+        clients=clients,
+        tags=tags,
+    )
+
+
+@bp.route("/sessions/overdue", methods=["GET"])
+@login_required
+def overdue_sessions():
+    """Planned sessions whose end time has passed, oldest first."""
+    stmt = (
+        trainer_sessions(current_user.id)
+        .where(Session.is_overdue)
         .options(
             selectinload(Session.session_tags).selectinload(SessionTag.tag)
         )
-        .order_by(Session.start_dt.desc())
+        .order_by(Session.start_dt)
     )
     sessions = db.session.execute(stmt).scalars().all()
-    return render_template("sessions/sessions.html", sessions=sessions)
+    return render_template("sessions/overdue.html", sessions=sessions)
 
 
 @bp.route("/sessions/<string:session_public_id>", methods=["GET", "POST"])
 @login_required
+@idempotent
 def session(session_public_id):
     stmt = (select(Session).where(
         Session.public_id == session_public_id,
@@ -55,7 +127,8 @@ def session(session_public_id):
             selectinload(Session.session_tags).selectinload(SessionTag.tag)
         )
     )
-    session_obj = db.session.execute(stmt).scalars().first()
+    with tracer.start_as_current_span("session.load"):
+        session_obj = db.session.execute(stmt).scalars().first()
 
     if not session_obj:
         abort(404)
@@ -78,7 +151,7 @@ def session(session_public_id):
 
     else:
         header_form = EditSessionForm(obj=session_obj)
-        header_form.start_dt.data = _utc_to_local(session_obj.start_dt)
+        header_form.start_dt.data = _utc_to_local(session_obj.start_dt, _trainer_tz())
         exercises_form = SessionExercisesHelperForm()
         for se in session_obj.session_exercises:
             entry = exercises_form.exercises.append_entry({
@@ -93,13 +166,32 @@ def session(session_public_id):
             entry = exercises_form.exercises.append_entry()
             entry.form.exercise.choices = exercise_choices
     
+    edit_conflict = None
     if request.method == "POST":
-        header_ok = header_form.validate()
-        exercises_ok = exercises_form.validate()
-        if header_ok and exercises_ok:
+        # Changed on another device since this form was loaded
+        if is_stale(session_obj):
+            edit_conflict = _session_edit_conflict(
+                session_obj, header_form, exercises_form, exercise_choices
+            )
+        with tracer.start_as_current_span("session.validate"):
+            header_ok = header_form.validate()
+            exercises_ok = exercises_form.validate()
+            if header_ok and _needs_overlap_check(session_obj, header_form):
+                conflicts = _find_conflicts(
+                    header_form.start_dt.data,
+                    header_form.duration_min.data,
+                    exclude_session_id=session_obj.id,
+                    exclude_group_id=session_obj.group_id
+                )
+                if conflicts:
+                    header_form.start_dt.errors.append(_conflicts_error(conflicts))
+                    header_ok = False
+        if edit_conflict is not None:
+            flash("This session was changed elsewhere. Review the differences and save again.", "warning")
+        elif header_ok and exercises_ok:
             paid_status = session_obj.is_paid
             header_form.populate_obj(session_obj)
-            session_obj.start_dt = _local_to_utc(session_obj.start_dt)
+            session_obj.start_dt = _local_to_utc(session_obj.start_dt, _trainer_tz())
             if session_obj.is_paid:
                 if not paid_status and session_obj.payment_date is None:
                     session_obj.payment_date = datetime.now(timezone.utc)
@@ -107,28 +199,30 @@ def session(session_public_id):
                 session_obj.payment_date = None
                 
             try:
-                db.session.query(SessionExercise).filter_by(
-                    session_id=session_obj.id
-                ).delete()
-
-                for entry in exercises_form.exercises:
-                    sub = entry.form
-                    ex = _get_or_create_exercise(sub.exercise.data, current_user.id)
-                    if not ex:
-                        continue  # Skip empty entries
-
-                    weight = sub.weight.data if sub.weight.data is not None else 0
-
-                    se = SessionExercise(
-                        session_id=session_obj.id,
-                        client_id=session_obj.client_id,
-                        exercise_id=ex.id,
-                        sets=sub.sets.data,
-                        reps=sub.reps.data or None,
-                        time_seconds=sub.time_seconds.data or None,
-                        weight=weight,
-                    )
-                    db.session.add(se)
+                with tracer.start_as_current_span("session.exercises") as span:
+                    span.set_attribute("exercises.count", len(exercises_form.exercises))
+                    db.session.query(SessionExercise).filter_by(
+                        session_id=session_obj.id
+                    ).delete()
+
+                    for entry in exercises_form.exercises:
+                        sub = entry.form
+                        ex = _get_or_create_exercise(sub.exercise.data, current_user.id)
+                        if not ex:
+                            continue  # Skip empty entries
+
+                        weight = sub.weight.data if sub.weight.data is not None else 0
+
+                        se = SessionExercise(
+                            session_id=session_obj.id,
+                            client_id=session_obj.client_id,
+                            exercise_id=ex.id,
+                            sets=sub.sets.data,
+                            reps=sub.reps.data or None,
+                            time_seconds=sub.time_seconds.data or None,
+                            weight=weight,
+                        )
+                        db.session.add(se)
 
                 # Update session tags
                 db.session.query(SessionTag).filter_by(
@@ -141,12 +235,28 @@ def session(session_public_id):
                         tag_id=tag_id,
                     ))
 
-                db.session.commit()
+                # Exercise and tag edits alone would not touch the row
+                bump_version(session_obj, "notes")
+                with tracer.start_as_current_span("session.commit"):
+                    db.session.flush()
+                    refresh_personal_records(session_obj)
+                    db.session.commit()
                 flash("Session updated successfully", "success")
                 return redirect(
                     url_for(".session",session_public_id=session_obj.public_id)
                 )
-            
+
+            except StaleDataError:
+                # Lost the race between the version check and the UPDATE;
+                # the rollback expires session_obj, so it reloads as saved now
+                db.session.rollback()
+                edit_conflict = _session_edit_conflict(
+                    session_obj, header_form, exercises_form, exercise_choices
+                )
+                flash("This session was changed elsewhere. Review the differences and save again.", "warning")
+
+            except DuplicateRequest:
+                raise
             except Exception:
                 db.session.rollback()
                 flash("Error updating session. Please try again", "danger")
@@ -157,10 +267,16 @@ def session(session_public_id):
                     exercises_form=exercises_form,
                     exercise_types=exercise_types,
                     all_tags=all_tags,
+                    record_metrics=session_record_metrics(session_obj.id),
                 )
         else:
             flash("Please correct the errors below.", "danger")
 
+    # Re-rendered invalid forms keep the version they were loaded with
+    form_version = session_obj.version_id
+    if edit_conflict is None and request.method == "POST":
+        form_version = submitted_version() or form_version
+
     return render_template(
         "sessions/session.html",
         session=session_obj,
@@ -168,11 +284,15 @@ def session(session_public_id):
         exercises_form=exercises_form,
         exercise_types=exercise_types,
         all_tags=all_tags,
-    )
+        record_metrics=session_record_metrics(session_obj.id),
+        form_version=form_version,
+        edit_conflict=edit_conflict,
+    ), 409 if edit_conflict is not None else 200
 
 
 @bp.route("/sessions/<string:session_public_id>/toggle-status", methods=["POST"])
 @login_required
+@idempotent
 def toggle_status(session_public_id):
     if not request.headers.get("HX-Request"):
         abort(404)
@@ -200,6 +320,8 @@ def toggle_status(session_public_id):
     else:
         abort(400)
 
+    db.session.flush()
+    refresh_personal_records(session_obj)
     db.session.commit()
 
     show_client = request.args.get("show_client", "0") == "1"
@@ -212,6 +334,7 @@ def toggle_status(session_public_id):
 
 @bp.route("/sessions/<string:session_public_id>/toggle-paid", methods=["POST"])
 @login_required
+@idempotent
 def toggle_paid(session_public_id):
     if not request.headers.get("HX-Request"):
         abort(404)
@@ -242,6 +365,7 @@ def toggle_paid(session_public_id):
 
 @bp.route("/sessions/<string:session_public_id>/delete", methods=["POST"])
 @login_required
+@idempotent
 def delete_session(session_public_id):
     stmt = select(Session).where(
         Session.public_id == session_public_id,
@@ -256,9 +380,12 @@ def delete_session(session_public_id):
         abort(403)
 
     try:
+        refresh_personal_records(session_obj, removed=True)
         db.session.delete(session_obj)
         db.session.commit()
         flash("Session deleted successfully", "success")
+    except DuplicateRequest:
+        raise
     except Exception:
         db.session.rollback()
         flash("Error deleting session. Please try again", "danger")
@@ -271,6 +398,7 @@ def delete_session(session_public_id):
 
 @bp.route("/sessions/add", methods=["GET", "POST"])
 @login_required
+@idempotent
 def add_session():
     # preselect client if route called from client card
     client_public_id = request.args.get("client_public_id", type=str)
@@ -360,7 +488,14 @@ def add_session():
     for subform in form.exercises:
         subform.exercise.choices = exercise_choices
 
-    if form.validate_on_submit():
+    form_ok = form.validate_on_submit()
+    if form_ok:
+        conflicts = _find_conflicts(form.start_dt.data, form.duration_min.data)
+        if conflicts:
+            form.start_dt.errors.append(_conflicts_error(conflicts))
+            form_ok = False
+
+    if form_ok:
         client = db.session.get(Client, form.client.data)
         if not client or client.trainer_id != current_user.id:
             abort(404)
@@ -370,7 +505,7 @@ def add_session():
         try:
             s = Session(
                 client_id=form.client.data,
-                start_dt=_local_to_utc(form.start_dt.data),
+                start_dt=_local_to_utc(form.start_dt.data, _trainer_tz()),
                 duration_min=form.duration_min.data,
                 price=form.price.data,
                 notes=form.notes.data.strip()
@@ -421,6 +556,8 @@ def add_session():
                 "danger"
             )
 
+        except DuplicateRequest:
+            raise
         except Exception:
             db.session.rollback()
             flash(
@@ -440,6 +577,111 @@ def add_session():
         copied_tag_ids=copied_tag_ids,
         exercise_types=exercise_types,
         all_tags=all_tags,
+        templates=trainer_templates(current_user.id),
+        free_slots_work_start=FREE_SLOTS_WORK_START,
+        free_slots_work_end=FREE_SLOTS_WORK_END,
+    )
+
+
+@bp.route("/sessions/group", methods=["GET", "POST"])
+@login_required
+@idempotent
+def add_group_session():
+    """One workout for several clients, with per-client price and weight overrides."""
+    form = GroupSessionForm()
+
+    clients = db.session.execute(
+        select(Client.id, Client.name, Client.price)
+        .where(
+            Client.trainer_id == current_user.id,
+            Client.status == "active",
+            Client.archived_at.is_(None)
+        )
+        .order_by(Client.name)
+    ).all()
+    form.clients.choices = [(c.id, c.name) for c in clients]
+
+    exercise_choices, exercise_types = _exercise_choices(current_user.id)
+    all_tags = db.session.execute(
+        select(Tag).where(Tag.trainer_id == current_user.id).order_by(Tag.name)
+    ).scalars().all()
+
+    if request.method == "GET" and not form.exercises:
+        form.exercises.append_entry()
+    for subform in form.exercises:
+        subform.exercise.choices = exercise_choices
+
+    form_ok = form.validate_on_submit()
+    if form_ok and len(set(form.clients.data)) > GROUP_SESSION_MAX_CLIENTS:
+        form.clients.errors.append(
+            f"A group can have at most {GROUP_SESSION_MAX_CLIENTS} clients."
+        )
+        form_ok = False
+    if form_ok:
+        conflicts = _find_conflicts(form.start_dt.data, form.duration_min.data)
+        if conflicts:
+            form.start_dt.errors.append(_conflicts_error(conflicts))
+            form_ok = False
+
+    if form_ok:
+        try:
+            created = _create_group_sessions(form, {c.id: c for c in clients})
+            db.session.commit()
+            flash(f"Group session added for {created} clients", "success")
+            return redirect(url_for(".sessions"))
+        except IntegrityError:
+            db.session.rollback()
+            flash(
+                (
+                    "Database error occurred."
+                    "Please check your inputs and try again."
+                ),
+                "danger"
+            )
+        except DuplicateRequest:
+            raise
+        except Exception:
+            db.session.rollback()
+            flash(
+                (
+                    "An unexpected error occured."
+                    "Please contact support if the issue persists."
+                ),
+                "danger"
+            )
+
+    return render_template(
+        "sessions/add_group_session.html",
+        form=form,
+        clients=clients,
+        has_clients=bool(clients),
+        exercise_types=exercise_types,
+        all_tags=all_tags,
+        overrides=_group_overrides_context(request.form, clients, exercise_choices),
+    )
+
+
+@bp.route("/sessions/group/overrides")
+@login_required
+def group_overrides():
+    """Per-client price and weight inputs for the selected clients (HTMX request)."""
+    if not request.headers.get("HX-Request"):
+        abort(404)
+
+    clients = db.session.execute(
+        select(Client.id, Client.name, Client.price)
+        .where(
+            Client.trainer_id == current_user.id,
+            Client.status == "active",
+            Client.archived_at.is_(None)
+        )
+        .order_by(Client.name)
+    ).all()
+    exercise_choices, _ = _exercise_choices(current_user.id)
+
+    return render_template(
+        "helpers/_group_overrides.html",
+        overrides=_group_overrides_context(request.args, clients, exercise_choices),
     )
 
 
@@ -514,6 +756,9 @@ def exercise_row():
     if not request.headers.get("HX-Request"):
         abort(404)
 
+    # Shared by the single and the group add forms
+    mode = "group" if request.args.get("mode") == "group" else "add"
+
     form = AddSessionForm(formdata=request.args)
     subform = form.exercises.append_entry()
 
@@ -523,8 +768,8 @@ def exercise_row():
     return render_template(
         "helpers/_exercise_row.html",
         subform=subform,
-        mode="add",
-        form_id="add-session-form",
+        mode=mode,
+        form_id=f"{mode}-session-form",
         exercise_types=exercise_types,
     )
 
@@ -567,7 +812,7 @@ def remove_exercise_row():
         abort(404)
 
     mode = request.form.get("mode")
-    if mode not in {"add", "edit"}:
+    if mode not in {"add", "edit", "group"}:
         abort(400)
 
     remove_index_raw = request.form.get("remove_index")
@@ -578,7 +823,7 @@ def remove_exercise_row():
     except ValueError:
         abort(400)
 
-    form_id = "add-session-form" if mode == "add" else "edit-session-form"
+    form_id = f"{mode}-session-form"
 
     orig_form = SessionExercisesHelperForm(formdata=request.form)
     new_form = SessionExercisesHelperForm()
@@ -628,6 +873,87 @@ def client_price():
     return render_template("helpers/_price_field.html", form=form)
 
 
+@bp.route("/sessions/conflicts")
+@login_required
+def session_conflicts():
+    """Warn about overlapping sessions while the form is being filled (HTMX request)."""
+    if not request.headers.get("HX-Request"):
+        abort(404)
+    if request.args.get("status") == FREE_SLOT_STATUS:
+        return ""
+
+    try:
+        start_dt = datetime.strptime(request.args.get("start_dt", ""), "%Y-%m-%dT%H:%M")
+    except ValueError:
+        return ""
+    duration_min = request.args.get("duration_min", type=int)
+    if not duration_min or not 1 <= duration_min <= 480:
+        return ""
+
+    exclude_session_id = exclude_group_id = None
+    session_public_id = request.args.get("session")
+    if session_public_id:
+        own = db.session.execute(
+            select(Session.id, Session.group_id).where(
+                Session.public_id == session_public_id,
+                Session.client.has(trainer_id=current_user.id)
+            )
+        ).first()
+        if own:
+            exclude_session_id, exclude_group_id = own
+
+    return render_template(
+        "helpers/_session_conflicts.html",
+        conflicts=_find_conflicts(
+            start_dt, duration_min, exclude_session_id, exclude_group_id
+        ),
+    )
+
+
+@bp.route("/sessions/free-slots")
+@login_required
+def free_slots():
+    """Free slots within working hours over a range of days (HTMX request)."""
+    if not request.headers.get("HX-Request"):
+        abort(404)
+
+    tz_name = _trainer_tz()
+    try:
+        date_from = datetime.strptime(request.args.get("date", ""), "%Y-%m-%d").date()
+    except ValueError:
+        date_from = datetime.now(ZoneInfo(tz_name)).date()
+    try:
+        work_start = datetime.strptime(
+            request.args.get("work_start") or FREE_SLOTS_WORK_START, "%H:%M"
+        ).time()
+        work_end = datetime.strptime(
+            request.args.get("work_end") or FREE_SLOTS_WORK_END, "%H:%M"
+        ).time()
+    except ValueError:
+        return ""
+    if work_end <= work_start:
+        return ""
+
+    days = request.args.get("days", FREE_SLOTS_DEFAULT_DAYS, type=int)
+    days = min(max(days, 1), FREE_SLOTS_MAX_DAYS)
+    duration_min = request.args.get("duration_min", type=int) or 60
+    duration_min = min(max(duration_min, 1), 480)
+
+    slots = find_free_slots(
+        current_user.id, tz_name, date_from, days,
+        work_start, work_end, timedelta(minutes=duration_min)
+    )
+    # Group by local day for display
+    slots_by_day = {}
+    for start, end in slots:
+        slots_by_day.setdefault(start.date(), []).append((start, end))
+
+    return render_template(
+        "helpers/_free_slots.html",
+        slots_by_day=slots_by_day,
+    )
+
+
 def _get_or_create_exercise(exercise_value: str, trainer_id: int) -> Exercise:
     """
     Get existing exercise by ID or create new one by name.
@@ -666,6 +992,163 @@ def _get_or_create_exercise(exercise_value: str, trainer_id: int) -> Exercise:
         return ex
 
 
+def _create_group_sessions(form: GroupSessionForm, clients: dict) -> int:
+    """
+    Write a whole group in three multi-row INSERTs: sessions (with RETURNING
+    ids), their exercises and their tags. Public ids are allocated in one
+    batch; the first one doubles as the group id.
+    """
+    client_ids = [cid for cid in dict.fromkeys(form.clients.data) if cid in clients]
+    if not client_ids:
+        abort(400)
+
+    exercises = []
+    for entry in form.exercises:
+        sub = entry.form
+        ex = _get_or_create_exercise(sub.exercise.data, current_user.id)
+        if not ex:
+            continue  # Skip empty entries
+        exercises.append((str(sub.exercise.data), ex.id, sub))
+
+    public_ids = generate_session_public_ids(len(client_ids))
+    start_dt = _local_to_utc(form.start_dt.data, _trainer_tz())
+    notes = form.notes.data.strip() if form.notes.data else None
+
+    rows = db.session.execute(
+        insert(Session).returning(
+            Session.id, Session.client_id, sort_by_parameter_order=True
+        ),
+        [
+            {
+                "public_id": public_id,
+                "group_id": public_ids[0],
+                "client_id": client_id,
+                "start_dt": start_dt,
+                "duration_min": form.duration_min.data,
+                "price": _override_price(client_id, clients[client_id].price),
+                "notes": notes,
+            }
+            for client_id, public_id in zip(client_ids, public_ids)
+        ]
+    ).all()
+
+    session_exercises = []
+    for session_id, client_id in rows:
+        for value, exercise_id, sub in exercises:
+            shared_weight = sub.weight.data if sub.weight.data is not None else 0
+            session_exercises.append({
+                "session_id": session_id,
+                "client_id": client_id,
+                "exercise_id": exercise_id,
+                "sets": sub.sets.data,
+                "reps": sub.reps.data or None,
+                "time_seconds": sub.time_seconds.data or None,
+                "weight": _override_weight(client_id, value, shared_weight),
+            })
+    if session_exercises:
+        db.session.execute(insert(SessionExercise), session_exercises)
+
+    tag_ids = request.form.getlist("tags", type=int)[:4]
+    if tag_ids:
+        db.session.execute(insert(SessionTag), [
+            {"session_id": session_id, "tag_id": tag_id}
+            for session_id, _ in rows
+            for tag_id in tag_ids
+        ])
+    return len(rows)
+
+
+def _override_price(client_id: int, default: int) -> int:
+    price = request.form.get(f"price-{client_id}", type=int)
+    return price if price is not None and price >= 0 else default
+
+
+def _override_weight(client_id: int, exercise_value: str, default):
+    raw = request.form.get(f"weight-{client_id}-{exercise_value}", "").strip()
+    if not raw:
+        return default
+    try:
+        weight = Decimal(raw.replace(",", "."))
+    except InvalidOperation:
+        return default
+    return weight if 0 <= weight < 1000 else default
+
+
+def _group_overrides_context(values, clients: list, exercise_choices: list) -> dict:
+    """Selected clients and exercises of the group form, with entered overrides."""
+    selected = set(values.getlist("clients", type=int))
+    names = dict(exercise_choices)
+    keys = [
+        key for key in values.keys()
+        if key.startswith("exercises-") and key.endswith("-exercise")
+        and key.split("-")[1].isdigit() and values.get(key)
+    ]
+    exercises = []
+    for key in sorted(keys, key=lambda k: int(k.split("-")[1])):
+        value = values.get(key)
+        exercises.append((value, names.get(value, value)))
+    return {
+        "clients": [c for c in clients if c.id in selected],
+        "exercises": list(dict.fromkeys(exercises)),
+        "values": values,
+    }
+
+
+def _session_edit_conflict(session_obj: Session, header_form: EditSessionForm,
+                           exercises_form: SessionExercisesHelperForm,
+                           exercise_choices: list) -> list:
+    """Differences between a stale edit and the session as saved now."""
+    conflicts = edit_conflicts(header_form, {
+        "start_dt": _utc_to_local(session_obj.start_dt, _trainer_tz()),
+        "duration_min": session_obj.duration_min,
+        "status": session_obj.status,
+        "price": session_obj.price,
+        "is_paid": session_obj.is_paid,
+        "notes": session_obj.notes,
+    })
+
+    # Exercises and tags are compared as a whole - no per-field takeover
+    names = dict(exercise_choices)
+    theirs = [
+        _exercise_summary(names.get(str(se.exercise_id), ""), se.sets,
+                          se.reps, se.time_seconds, se.weight)
+        for se in session_obj.session_exercises
+    ]
+    yours = [
+        _exercise_summary(names.get(str(e.exercise.data), e.exercise.data),
+                          e.sets.data, e.reps.data, e.time_seconds.data,
+                          e.weight.data)
+        for e in (entry.form for entry in exercises_form.exercises)
+        if e.exercise.data
+    ]
+    if theirs != yours:
+        conflicts.append({
+            "name": None,
+            "label": "Exercises",
+            "theirs": "; ".join(theirs),
+            "yours": "; ".join(yours),
+        })
+
+    saved_tags = {st.tag_id for st in session_obj.session_tags}
+    submitted_tags = set(request.form.getlist("tags", type=int)[:4])
+    if saved_tags != submitted_tags:
+        conflicts.append({
+            "name": None,
+            "label": "Tags",
+            "theirs": ", ".join(st.tag.name for st in session_obj.session_tags),
+            "yours": f"{len(submitted_tags)} selected",
+        })
+    return conflicts
+
+
+def _exercise_summary(name: str, sets, reps, time_seconds, weight) -> str:
+    amount = f"{reps}" if reps else f"{time_seconds or 0}s"
+    summary = f"{name} {sets}x{amount}"
+    if weight:
+        summary += f" @ {Decimal(str(weight)).normalize():f}"
+    return summary
+
+
 def _exercise_choices(user_id: int):
     """Get exercise choices for select fields."""
     exercises = db.session.execute(
@@ -681,14 +1164,60 @@ def _exercise_choices(user_id: int):
     return choices, type_map
 
 
-def _local_to_utc(naive_dt: datetime, tz_name: str = "Europe/Kyiv") -> datetime:
+def _find_conflicts(local_start: datetime, duration_min: int,
+                    exclude_session_id: int = None,
+                    exclude_group_id: str = None) -> list:
+    """Sessions overlapping a slot given in local time (served by the GiST index)."""
+    stmt = overlapping_sessions(
+        current_user.id,
+        _local_to_utc(local_start, _trainer_tz()),
+        duration_min,
+        exclude_session_id,
+        exclude_group_id
+    )
+    return db.session.execute(stmt).scalars().all()
+
+
+def _needs_overlap_check(session_obj: Session, form: EditSessionForm) -> bool:
+    """
+    Only a move, a resize or a reactivation can create a new overlap, so
+    sessions that already overlap (old history, API writes) stay editable.
+    """
+    if form.status.data == FREE_SLOT_STATUS:
+        return False
+    if session_obj.status == FREE_SLOT_STATUS:
+        return True
+    return (
+        _local_to_utc(form.start_dt.data, _trainer_tz()) != session_obj.start_dt
+        or form.duration_min.data != session_obj.duration_min
+    )
+
+
+def _conflicts_error(conflicts: list) -> str:
+    """Form error text for overlapping sessions."""
+    first = conflicts[0]
+    message = "Overlaps with {} at {}".format(
+        first.client.name,
+        _utc_to_local(first.start_dt, _trainer_tz()).strftime("%d.%m %H:%M")
+    )
+    if len(conflicts) > 1:
+        message += f" and {len(conflicts) - 1} more"
+    return message + "."
+
+
+def _trainer_tz() -> str:
+    """The trainer's timezone; form datetimes are entered and shown in it."""
+    return current_user.timezone or "Europe/Kyiv"
+
+
+def _local_to_utc(naive_dt: datetime, tz_name: str) -> datetime:
     """Convert naive local datetime to UTC."""
     local_tz = ZoneInfo(tz_name)
     local_dt = naive_dt.replace(tzinfo=local_tz)
     return local_dt.astimezone(timezone.utc)
 
 
-def _utc_to_local(dt: datetime, tz_name: str = "Europe/Kyiv") -> datetime:
+def _utc_to_local(dt: datetime, tz_name: str) -> datetime:
     """Convert UTC datetime to naive local datetime for form display."""
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
@@ -0,0 +1,27 @@
+from flask import abort, jsonify, request
+from flask_login import login_required, current_user
+
+from app.sync import changes_since
+from app.constants import SYNC_PAGE_SIZE, SYNC_MAX_PAGE_SIZE
+
+from . import bp
+
+
+@bp.route("/sync", methods=["GET"])
+@login_required
+def sync():
+    """
+    Delta sync for offline clients: rows changed after ?cursor= (omit it
+    for a full sync) and tombstones of deleted ones. Call again with the
+    returned cursor while "more" is true.
+    """
+    limit = request.args.get("limit", SYNC_PAGE_SIZE, type=int)
+    limit = min(max(limit, 1), SYNC_MAX_PAGE_SIZE)
+    try:
+        result = changes_since(current_user.id, request.args.get("cursor"), limit)
+    except ValueError:
+        abort(400)
+
+    response = jsonify(result)
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -1,21 +1,20 @@
 from datetime import datetime, timedelta
 
-from flask import render_template, redirect, url_for, flash
+from flask import current_app, render_template, redirect, url_for, flash
 from flask_login import (
     login_user, logout_user,
     login_required, current_user,
 )
-from werkzeug.security import (
-    generate_password_hash, check_password_hash,
-)
 from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import selectinload
 from zoneinfo import ZoneInfo
 
 from app import db
 from app.models import Trainer, Client, Session, SessionTag
-from app.forms import RegisterForm, LoginForm
+from app.forms import RegisterForm, LoginForm, SettingsForm, ChangePasswordForm
+from app.identity import invalidate_identity
+from app.utils import HashingBusy, hash_password, needs_rehash, verify_password
 
 from . import bp
 
@@ -77,10 +76,24 @@ def login():
         stmt = select(Trainer).where(Trainer.email == email)
         trainer = db.session.execute(stmt).scalar_one_or_none()
 
-        if (
-            trainer
-            and check_password_hash(trainer.password_hash, form.password.data)
-        ):
+        try:
+            valid = trainer is not None and verify_password(
+                trainer.password_hash, form.password.data
+            )
+            # Hashes from before a parameter change are upgraded on login
+            if valid and needs_rehash(trainer.password_hash):
+                trainer.password_hash = hash_password(form.password.data)
+                try:
+                    db.session.commit()
+                except SQLAlchemyError:
+                    # The old hash still verifies - upgrade on a later login
+                    db.session.rollback()
+                    current_app.logger.exception("Could not rehash password")
+        except HashingBusy:
+            form.password.errors.append("Too many logins right now. Please try again.")
+            return render_template("user/login.html", form=form), 503
+
+        if valid:
             login_user(trainer, remember=form.remember_me.data)
             flash("Login successful", "success")
             return redirect(url_for(".index"))
@@ -106,7 +119,11 @@ def register():
     if form.validate_on_submit():
         username = form.username.data.strip()
         email = form.email.data.strip().lower()
-        password_hash = generate_password_hash(form.password.data)
+        try:
+            password_hash = hash_password(form.password.data)
+        except HashingBusy:
+            form.password.errors.append("Server is busy. Please try again.")
+            return render_template("user/register.html", form=form), 503
 
         new_trainer = Trainer(
             name=username,
@@ -129,3 +146,72 @@ def register():
         return redirect(url_for(".index"))
 
     return render_template("user/register.html", form=form)
+
+
+@bp.route("/settings", methods=["GET", "POST"])
+@login_required
+def settings():
+    form = SettingsForm(obj=current_user)
+    if form.validate_on_submit():
+        # current_user is a cached identity - change the row itself
+        trainer = db.session.get(Trainer, current_user.id)
+        trainer.overdue_action = form.overdue_action.data
+        try:
+            db.session.commit()
+            invalidate_identity(trainer.id)
+            flash("Settings saved", "success")
+            return redirect(url_for(".settings"))
+        except Exception:
+            db.session.rollback()
+            flash("Error saving settings. Please try again", "danger")
+
+    return render_template(
+        "user/settings.html",
+        form=form,
+        password_form=ChangePasswordForm(formdata=None),
+    )
+
+
+@bp.route("/settings/password", methods=["POST"])
+@login_required
+def change_password():
+    password_form = ChangePasswordForm()
+    trainer = db.session.get(Trainer, current_user.id)
+    if password_form.validate_on_submit():
+        try:
+            valid = verify_password(
+                trainer.password_hash, password_form.current_password.data
+            )
+            if valid:
+                trainer.password_hash = hash_password(password_form.password.data)
+        except HashingBusy:
+            password_form.current_password.errors.append(
+                "Server is busy. Please try again."
+            )
+            return render_template(
+                "user/settings.html",
+                form=SettingsForm(obj=current_user, formdata=None),
+                password_form=password_form,
+            ), 503
+
+        if valid:
+            # Signs out every other session of this trainer
+            trainer.credential_version += 1
+            try:
+                db.session.commit()
+                invalidate_identity(trainer.id)
+                # Re-stamp this session with the new version
+                login_user(trainer)
+                flash("Password changed", "success")
+                return redirect(url_for(".settings"))
+            except Exception:
+                db.session.rollback()
+                flash("Error changing password. Please try again", "danger")
+        else:
+            password_form.current_password.errors.append("Wrong password.")
+
+    return render_template(
+        "user/settings.html",
+        form=SettingsForm(obj=current_user, formdata=None),
+        password_form=password_form,
+    )
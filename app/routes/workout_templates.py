@@ -0,0 +1,160 @@
+from datetime import timezone
+from zoneinfo import ZoneInfo
+
+from flask import abort, render_template, redirect, url_for, flash
+from flask_login import login_required, current_user
+from sqlalchemy import exists, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models import (
+    Client, Session,
+    WorkoutTemplate, WorkoutTemplateExercise, WorkoutTemplateTag,
+)
+from app.forms import SaveTemplateForm, ApplyTemplateForm
+from app.queries import overlapping_sessions
+from app.workout_templates import apply_template, create_template_from_session
+
+from . import bp
+
+
+@bp.route("/templates", methods=["GET"])
+@login_required
+def workout_templates():
+    return redirect(url_for(".references", tab="templates"))
+
+
+@bp.route("/sessions/<string:session_public_id>/save-template", methods=["POST"])
+@login_required
+def save_template(session_public_id):
+    session_obj = db.session.execute(
+        select(Session).where(
+            Session.public_id == session_public_id,
+            Session.client.has(trainer_id=current_user.id)
+        )
+    ).scalars().first()
+    if not session_obj:
+        abort(404)
+
+    form = SaveTemplateForm()
+    if not form.validate_on_submit():
+        for error in form.name.errors:
+            flash(error, "danger")
+        return redirect(url_for(".session", session_public_id=session_public_id))
+
+    name = " ".join(form.name.data.split())
+    name_taken = db.session.execute(
+        select(
+            exists().where(
+                WorkoutTemplate.trainer_id == current_user.id,
+                func.lower(WorkoutTemplate.name) == name.lower()
+            )
+        )
+    ).scalar()
+    if name_taken:
+        flash("A template with this name already exists.", "danger")
+        return redirect(url_for(".session", session_public_id=session_public_id))
+
+    try:
+        template = create_template_from_session(session_obj, current_user.id, name)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        flash("A template with this name already exists.", "danger")
+        return redirect(url_for(".session", session_public_id=session_public_id))
+
+    flash("Template saved successfully", "success")
+    return redirect(url_for(".workout_template", template_id=template.id))
+
+
+@bp.route("/templates/<int:template_id>", methods=["GET", "POST"])
+@login_required
+def workout_template(template_id):
+    template = db.session.execute(
+        select(WorkoutTemplate)
+        .where(
+            WorkoutTemplate.id == template_id,
+            WorkoutTemplate.trainer_id == current_user.id
+        )
+        .options(
+            selectinload(WorkoutTemplate.template_exercises)
+            .selectinload(WorkoutTemplateExercise.exercise),
+            selectinload(WorkoutTemplate.template_tags)
+            .selectinload(WorkoutTemplateTag.tag),
+        )
+    ).scalars().first()
+    if not template:
+        abort(404)
+
+    form = ApplyTemplateForm()
+    clients = db.session.execute(
+        select(Client.id, Client.name)
+        .where(
+            Client.trainer_id == current_user.id,
+            Client.status == "active",
+            Client.archived_at.is_(None)
+        )
+        .order_by(Client.name)
+    ).all()
+    form.client.choices = [(0, "Select Client")] + [(c.id, c.name) for c in clients]
+
+    if form.validate_on_submit():
+        client = db.session.get(Client, form.client.data)
+        if not client or client.trainer_id != current_user.id:
+            abort(404)
+        if client.archived_at:
+            abort(403)
+
+        tz = ZoneInfo(current_user.timezone or "Europe/Kyiv")
+        start_dt = form.start_dt.data.replace(tzinfo=tz).astimezone(timezone.utc)
+
+        conflict = db.session.execute(
+            overlapping_sessions(current_user.id, start_dt, template.duration_min)
+            .limit(1)
+        ).scalars().first()
+        if conflict:
+            form.start_dt.errors.append(
+                f"Overlaps with a session of {conflict.client.name}."
+            )
+        else:
+            try:
+                session_obj = apply_template(template, client, start_dt)
+                db.session.commit()
+                flash("Session created from template", "success")
+                return redirect(
+                    url_for(".session", session_public_id=session_obj.public_id)
+                )
+            except Exception:
+                db.session.rollback()
+                flash("Error creating session. Please try again", "danger")
+
+    return render_template(
+        "workout_templates/workout_template.html",
+        template=template,
+        form=form,
+    )
+
+
+@bp.route("/templates/<int:template_id>/delete", methods=["POST"])
+@login_required
+def delete_workout_template(template_id):
+    template = db.session.execute(
+        select(WorkoutTemplate).where(
+            WorkoutTemplate.id == template_id,
+            WorkoutTemplate.trainer_id == current_user.id
+        )
+    ).scalars().first()
+    if not template:
+        abort(404)
+
+    try:
+        db.session.delete(template)
+        db.session.commit()
+        flash("Template deleted successfully", "success")
+    except Exception:
+        db.session.rollback()
+        flash("Error deleting template. Please try again", "danger")
+        return redirect(url_for(".workout_template", template_id=template_id))
+
+    return redirect(url_for(".references", tab="templates"))
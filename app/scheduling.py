@@ -0,0 +1,91 @@
+"""Free-slot search over a trainer's schedule."""
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import DateTime, func, literal, select
+
+from app import db
+from app.models import Client, Session
+from app.queries import FREE_SLOT_STATUS, session_range
+
+
+def busy_intervals(trainer_id: int, start: datetime, end: datetime) -> list:
+    """
+    (start, end) UTC pairs of non-cancelled sessions touching [start, end),
+    ordered by start. One && query, served by ix_sessions_time_range.
+    """
+    window = func.tstzrange(
+        literal(start, DateTime(timezone=True)),
+        literal(end, DateTime(timezone=True))
+    )
+    rows = db.session.execute(
+        select(Session.start_dt, Session.duration_min)
+        .join(Session.client)
+        .where(
+            Client.trainer_id == trainer_id,
+            Session.status != FREE_SLOT_STATUS,
+            session_range(Session.start_dt, Session.duration_min).op("&&")(window)
+        )
+        .order_by(Session.start_dt)
+    ).all()
+    return [
+        (row.start_dt, row.start_dt + timedelta(minutes=row.duration_min))
+        for row in rows
+    ]
+
+
+def working_windows(date_from: date, days: int, work_start: time,
+                    work_end: time, tz: ZoneInfo) -> list:
+    """Working hours of each local day as UTC pairs (DST-safe)."""
+    windows = []
+    for offset in range(days):
+        day = date_from + timedelta(days=offset)
+        windows.append((
+            datetime.combine(day, work_start, tzinfo=tz).astimezone(timezone.utc),
+            datetime.combine(day, work_end, tzinfo=tz).astimezone(timezone.utc),
+        ))
+    return windows
+
+
+def free_slots(windows: list, busy: list, min_duration: timedelta,
+               not_before: datetime = None) -> list:
+    """
+    Gaps of at least min_duration inside the windows.
+
+    Both lists must be sorted by start. One sweep: busy intervals that end
+    before the current window are dropped for good, so each is passed over
+    at most once per window it overlaps.
+    """
+    slots = []
+    first = 0
+    for win_start, win_end in windows:
+        cursor = win_start if not_before is None else max(win_start, not_before)
+        while first < len(busy) and busy[first][1] <= cursor:
+            first += 1
+
+        i = first
+        while i < len(busy) and busy[i][0] < win_end:
+            busy_start, busy_end = busy[i]
+            if busy_start - cursor >= min_duration:
+                slots.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            i += 1
+
+        if win_end - cursor >= min_duration:
+            slots.append((cursor, win_end))
+    return slots
+
+
+def find_free_slots(trainer_id: int, tz_name: str, date_from: date, days: int,
+                    work_start: time, work_end: time, min_duration: timedelta) -> list:
+    """Free slots of a trainer as (local start, local end) pairs, never in the past."""
+    tz = ZoneInfo(tz_name)
+    windows = working_windows(date_from, days, work_start, work_end, tz)
+    if not windows:
+        return []
+    busy = busy_intervals(trainer_id, windows[0][0], windows[-1][1])
+    slots = free_slots(
+        windows, busy, min_duration,
+        not_before=datetime.now(timezone.utc)
+    )
+    return [(start.astimezone(tz), end.astimezone(tz)) for start, end in slots]
@@ -1,16 +1,22 @@
 // ----- Tooltip initialization -----
-(() => {
-    'use strict';
-    const tooltipTriggerList = Array.from(
-        document.querySelectorAll('[data-bs-toggle="tooltip"]')
-    );
-    tooltipTriggerList.forEach((tooltipTriggerEl) => {
-        new bootstrap.Tooltip(tooltipTriggerEl);
-    });
-})();
+// htmx:load fires for the initial page and for every swapped-in element,
+// so tooltips in fragments and boosted pages are set up too
+function initTooltips(root) {
+    const selector = '[data-bs-toggle="tooltip"]';
+    const elements = Array.from(root.querySelectorAll(selector));
+    if (root.matches(selector)) elements.push(root);
+    elements.forEach((el) => bootstrap.Tooltip.getOrCreateInstance(el));
+}
+document.addEventListener('htmx:load', (e) => initTooltips(e.detail.elt));
+
+// Swapped-out elements take their instances (and any open tooltip) along
+document.addEventListener('htmx:beforeCleanupElement', (e) => {
+    const tooltip = bootstrap.Tooltip.getInstance(e.detail.elt);
+    if (tooltip) tooltip.dispose();
+});
 
 // ----- Flash message auto-hide -----
-document.addEventListener('DOMContentLoaded', () => {
+function hideFlash() {
     const flashContainer = document.getElementById('flash-container');
     if (flashContainer) {
         setTimeout(() => {
@@ -23,4 +29,32 @@ document.addEventListener('DOMContentLoaded', () => {
 
         }, 5000);
     }
-});
\ No newline at end of file
+}
+document.addEventListener('DOMContentLoaded', hideFlash);
+
+// ----- Boosted navigation -----
+// Only #page is swapped, so the nav highlight is updated here the same way
+// layout.html sets it on a full render
+function updateNavState() {
+    const path = window.location.pathname;
+    document.querySelectorAll('[data-nav-path]').forEach((link) => {
+        const navPath = link.dataset.navPath;
+        const active = navPath === '/' ? path === '/' : path.includes(navPath);
+        const mobile = link.closest('.mobile-bottom-nav') !== null;
+        if (navPath === '/') {
+            const icon = link.querySelector('i');
+            icon.classList.toggle('text-success', active);
+            if (mobile) icon.classList.toggle('text-body-secondary', !active);
+        } else if (mobile) {
+            link.classList.toggle('text-primary', active);
+            link.classList.toggle('text-body-secondary', !active);
+        } else {
+            link.classList.toggle('active', active);
+        }
+    });
+}
+document.addEventListener('htmx:afterSettle', (e) => {
+    if (!e.detail.boosted) return;
+    updateNavState();
+    hideFlash();
+});
@@ -200,6 +200,16 @@
     document.body.addEventListener("click", (event) => {
         const addBtn = event.target.closest(".js-add-exercise");
         const removeBtn = event.target.closest(".js-remove-exercise");
+        const freeSlotBtn = event.target.closest(".js-free-slot");
+
+        // Free-slot finder: copy the slot into the form and re-check conflicts
+        if (freeSlotBtn) {
+            var startInput = document.getElementById("start_dt");
+            if (startInput) {
+                startInput.value = freeSlotBtn.dataset.start;
+                startInput.dispatchEvent(new Event("change", { bubbles: true }));
+            }
+        }
 
         if (addBtn) {
             document.body.addEventListener("htmx:afterSwap", function handleAdd(e) {
@@ -1,12 +1,14 @@
 // ----- Make table rows clickable -----
-document.addEventListener('DOMContentLoaded', () => {
-    document.querySelectorAll('.table-row-link').forEach((row) => {
-        row.addEventListener('click', (e) => {
-            if (e.target.closest('.toggle-paid') || e.target.closest('.toggle-status')) return;
-            const url = row.getAttribute('data-url');
-            if (url) {
-                window.location.href = url;
-            }
-        });
+// Delegated, so rows swapped in by HTMX (lazy sections, "load more") work too
+if (!window.tableRowLinkBound) {
+    window.tableRowLinkBound = true;
+    document.addEventListener('click', (e) => {
+        const row = e.target.closest('.table-row-link');
+        if (!row) return;
+        if (e.target.closest('.toggle-paid') || e.target.closest('.toggle-status')) return;
+        const url = row.getAttribute('data-url');
+        if (url) {
+            window.location.href = url;
+        }
     });
-});
\ No newline at end of file
+}
@@ -0,0 +1,227 @@
+"""
+Delta sync for offline-capable clients.
+
+Synced tables carry change_seq, taken from one global sequence on INSERT
+and bumped by the sync_touch trigger on UPDATE; DELETEs leave a row in
+sync_tombstones with a number from the same sequence. A client keeps the
+cursor of its last sync and receives only rows numbered after it.
+
+Sequence numbers are handed out before commit, so a slow transaction can
+commit a number below ones already visible. The cursor therefore only
+advances past rows older than SYNC_SETTLE_SECONDS; newer rows are sent but
+sent again next time, and clients apply changes as idempotent upserts.
+"""
+import time
+from datetime import timedelta
+
+from sqlalchemy import delete, func, literal_column, select
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models import (
+    Client, Exercise, Session, SessionExercise, SessionTag, SyncTombstone, Tag,
+)
+from app.utils import json_value
+from app.constants import (
+    SYNC_PAGE_SIZE,
+    SYNC_SETTLE_SECONDS,
+    SYNC_TOMBSTONE_TTL_DAYS,
+)
+
+
+def encode_cursor(seq: int) -> str:
+    """Cursor for a sequence number, stamped with its issue time."""
+    return f"{seq}.{int(time.time())}"
+
+
+def decode_cursor(cursor: str):
+    """(seq, issued_at) of a cursor; raises ValueError if malformed."""
+    seq, issued_at = cursor.split(".")
+    return int(seq), int(issued_at)
+
+
+def changes_since(trainer_id: int, cursor: str = None,
+                  limit: int = SYNC_PAGE_SIZE) -> dict:
+    """
+    A trainer's rows changed after cursor (None for a full sync), at most
+    `limit` per table. "more" asks the client to call again with the new
+    cursor; "reset" means its cursor expired and it must drop local data.
+    """
+    since, reset = 0, False
+    if cursor:
+        since, issued_at = decode_cursor(cursor)
+        if issued_at < time.time() - SYNC_TOMBSTONE_TTL_DAYS * 86400:
+            since, reset = 0, True
+
+    pages = {
+        name: _page(name, stmt, seq_col, changed_col, since, limit)
+        for name, (stmt, seq_col, changed_col) in _feeds(trainer_id).items()
+    }
+
+    # A table with more rows than the page limits how far the cursor may go
+    page_end = min(
+        (rows[-1]["_seq"] for rows, full in pages.values() if full),
+        default=None
+    )
+    rows = sorted(
+        (row for rows, _ in pages.values() for row in rows),
+        key=lambda row: row["_seq"]
+    )
+    if page_end is not None:
+        rows = [row for row in rows if row["_seq"] <= page_end]
+
+    new_cursor = since
+    for row in rows:
+        if not row["_settled"]:
+            break
+        new_cursor = row["_seq"]
+    if page_end is not None and new_cursor == since:
+        # A full page of unsettled rows - move on rather than loop
+        new_cursor = page_end
+
+    changes = {name: [] for name in pages if name != "deleted"}
+    deleted = []
+    for row in rows:
+        table = row.pop("_table")
+        del row["_seq"], row["_settled"]
+        if table == "deleted":
+            deleted.append(row)
+        else:
+            changes[table].append(row)
+
+    return {
+        "cursor": encode_cursor(new_cursor),
+        "more": page_end is not None,
+        "reset": reset,
+        "changes": changes,
+        "deleted": deleted,
+    }
+
+
+def purge_tombstones() -> int:
+    """Delete tombstones past SYNC_TOMBSTONE_TTL_DAYS; returns the count."""
+    cutoff = func.now() - timedelta(days=SYNC_TOMBSTONE_TTL_DAYS)
+    result = db.session.execute(
+        delete(SyncTombstone).where(SyncTombstone.deleted_at < cutoff)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def _feeds(trainer_id: int) -> dict:
+    """
+    Per-table (select, change_seq column, change time column). Sessions
+    and their exercises are scoped through clients; the other tables are
+    served by their (trainer_id, change_seq) indexes.
+    """
+    clients = select(
+        Client.public_id.label("id"),
+        Client.name,
+        Client.contact,
+        Client.notes,
+        Client.price,
+        Client.status,
+        Client.archived_at,
+        Client.version_id,
+        Client.updated_at,
+    ).where(Client.trainer_id == trainer_id)
+
+    tag_ids = (
+        select(func.coalesce(
+            func.array_agg(SessionTag.tag_id),
+            literal_column("'{}'::integer[]")
+        ))
+        .where(SessionTag.session_id == Session.id)
+        .scalar_subquery()
+    )
+    sessions = (
+        select(
+            Session.public_id.label("id"),
+            Client.public_id.label("client_id"),
+            Session.start_dt,
+            Session.duration_min,
+            Session.status,
+            Session.price,
+            Session.is_paid,
+            Session.payment_date,
+            Session.notes,
+            Session.group_id,
+            Session.version_id,
+            tag_ids.label("tag_ids"),
+            Session.updated_at,
+        )
+        .join(Session.client)
+        .where(Client.trainer_id == trainer_id)
+    )
+
+    se_session = aliased(Session)
+    session_exercises = (
+        select(
+            SessionExercise.id,
+            se_session.public_id.label("session_id"),
+            SessionExercise.exercise_id,
+            SessionExercise.sets,
+            SessionExercise.reps,
+            SessionExercise.time_seconds,
+            SessionExercise.weight,
+            SessionExercise.updated_at,
+        )
+        .join(se_session, se_session.id == SessionExercise.session_id)
+        .join(Client, Client.id == SessionExercise.client_id)
+        .where(Client.trainer_id == trainer_id)
+    )
+
+    exercises = select(
+        Exercise.id,
+        Exercise.name,
+        Exercise.type,
+        Exercise.is_active,
+        Exercise.description,
+        Exercise.updated_at,
+    ).where(Exercise.trainer_id == trainer_id)
+
+    tags = select(
+        Tag.id,
+        Tag.name,
+        Tag.color,
+        Tag.updated_at,
+    ).where(Tag.trainer_id == trainer_id)
+
+    deleted = select(
+        SyncTombstone.table_name.label("table"),
+        SyncTombstone.row_key.label("id"),
+        SyncTombstone.deleted_at,
+    ).where(SyncTombstone.trainer_id == trainer_id)
+
+    return {
+        "clients": (clients, Client.change_seq, Client.updated_at),
+        "sessions": (sessions, Session.change_seq, Session.updated_at),
+        "session_exercises": (
+            session_exercises,
+            SessionExercise.change_seq,
+            SessionExercise.updated_at
+        ),
+        "exercises": (exercises, Exercise.change_seq, Exercise.updated_at),
+        "tags": (tags, Tag.change_seq, Tag.updated_at),
+        "deleted": (deleted, SyncTombstone.seq, SyncTombstone.deleted_at),
+    }
+
+
+def _page(name: str, stmt, seq_col, changed_col, since: int, limit: int):
+    """(rows as dicts, whether more rows follow) of one feed after since."""
+    settled_before = func.now() - timedelta(seconds=SYNC_SETTLE_SECONDS)
+    stmt = (
+        stmt.add_columns(
+            seq_col.label("_seq"),
+            (changed_col < settled_before).label("_settled"),
+        )
+        .where(seq_col > since)
+        .order_by(seq_col)
+        .limit(limit + 1)
+    )
+    rows = [
+        {key: json_value(value) for key, value in row.items()} | {"_table": name}
+        for row in db.session.execute(stmt).mappings()
+    ]
+    return rows[:limit], len(rows) > limit
+
@@ -0,0 +1,64 @@
+"""
+OpenTelemetry tracing: a span per request with child spans for SQL
+statements, template rendering and the steps views mark themselves
+(see `tracer.start_as_current_span` in app/routes/sessions.py).
+
+Spans are written as JSON lines to stdout or TRACING_FILE - no collector
+is needed - and log records carry the current trace and span ids. With
+TRACING_ENABLED unset no provider is installed and the spans views open
+are the API's no-op spans.
+"""
+import os
+import sys
+
+from opentelemetry import trace
+
+from app import db
+
+
+SERVICE = "trainerjournal"
+# Regexes searched in request URLs
+EXCLUDED_URLS = "/static/,/metrics,/healthz,/readyz"
+
+
+def init_tracing(app):
+    """Call after db.init_app - SQL spans hook into the app's engine."""
+    if not app.config.get("TRACING_ENABLED"):
+        return
+
+    # SDK and instrumentations are only imported when tracing is on
+    from opentelemetry.instrumentation.flask import FlaskInstrumentor
+    from opentelemetry.instrumentation.jinja2 import Jinja2Instrumentor
+    from opentelemetry.instrumentation.logging import LoggingInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: SERVICE}),
+        # Follow the caller's decision when a request arrives with one
+        sampler=ParentBased(TraceIdRatioBased(app.config["TRACING_SAMPLE_RATIO"])),
+    )
+    provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter(
+        out=_output(app.config.get("TRACING_FILE")),
+        formatter=lambda span: span.to_json(indent=None) + os.linesep,
+    )))
+    trace.set_tracer_provider(provider)
+
+    FlaskInstrumentor().instrument_app(app, excluded_urls=EXCLUDED_URLS)
+    with app.app_context():
+        SQLAlchemyInstrumentor().instrument(engine=db.engine)
+    Jinja2Instrumentor().instrument()
+    LoggingInstrumentor().instrument(set_logging_format=True)
+
+
+def _output(path):
+    # Line-buffered appends keep each span on its own line across workers
+    if not path:
+        return sys.stdout
+    return open(path, "a", buffering=1, encoding="utf-8")
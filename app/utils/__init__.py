@@ -1,7 +1,28 @@
 # flake8: noqa: F401,E402
 
 from .template_filters import init_template_filters
+from .compression import init_compression
+from .csrf import MaskedCSRFProtect
+from .assets import init_assets
+from .partials import init_partials
+from .streaming import stream_page, stream_rows
 from .database import (
     generate_client_public_id,
-    generate_session_public_id
-)
\ No newline at end of file
+    generate_session_public_id,
+    generate_client_public_ids,
+    generate_session_public_ids,
+)
+from .cache import TTLCache
+from .concurrency import (
+    bump_version,
+    edit_conflicts,
+    is_stale,
+    submitted_version,
+)
+from .serialization import json_value
+from .passwords import (
+    HashingBusy,
+    hash_password,
+    needs_rehash,
+    verify_password,
+)
@@ -0,0 +1,93 @@
+"""
+Fingerprinted, precompressed static assets.
+
+At startup every file in the static folder is hashed and compressed once
+in memory. url_for("static", filename="styles.css") then yields
+styles.<hash>.css, served with immutable cache headers in the encoding
+the client prefers; unknown names fall back to Flask's static view. In
+debug mode URLs stay plain so edited files show up without a restart.
+"""
+import hashlib
+import mimetypes
+import os
+from dataclasses import dataclass, field
+
+from flask import Response, request
+
+from app.constants import COMPRESS_MIMETYPES, STATIC_IMMUTABLE_MAX_AGE
+from .compression import available_encodings, compress, preferred_encoding
+
+
+@dataclass
+class Asset:
+    digest: str
+    mimetype: str
+    # encoding -> body; "identity" is always present
+    bodies: dict = field(default_factory=dict)
+
+
+def init_assets(app):
+    if app.debug:
+        return
+
+    assets, fingerprinted = {}, {}
+    for filename, path in _static_files(app.static_folder):
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        asset = Asset(digest=digest, mimetype=mimetype, bodies={"identity": data})
+        if mimetype in COMPRESS_MIMETYPES:
+            for encoding in available_encodings():
+                compressed = compress(data, encoding, best=True)
+                if len(compressed) < len(data):
+                    asset.bodies[encoding] = compressed
+        assets[filename] = asset
+        fingerprinted[_fingerprint(filename, digest)] = filename
+
+    urls = {original: name for name, original in fingerprinted.items()}
+    send_static_file = app.view_functions["static"]
+
+    @app.url_defaults
+    def _fingerprint_static_urls(endpoint, values):
+        if endpoint == "static" and values.get("filename") in urls:
+            values["filename"] = urls[values["filename"]]
+
+    def static(filename):
+        original = fingerprinted.get(filename)
+        if original is None:
+            return send_static_file(filename=filename)
+        return _asset_response(assets[original])
+
+    app.view_functions["static"] = static
+
+
+def _asset_response(asset: Asset) -> Response:
+    encoding = preferred_encoding(
+        [e for e in available_encodings() if e in asset.bodies]
+    )
+    response = Response(asset.bodies[encoding], mimetype=asset.mimetype)
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    response.set_etag(f"{asset.digest}-{encoding}")
+    return response.make_conditional(request)
+
+
+def _static_files(folder: str):
+    """(URL filename, path) of every static file, with "/" separators."""
+    for root, _, files in os.walk(folder):
+        for name in files:
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, folder).replace(os.sep, "/"), path
+
+
+def _fingerprint(filename: str, digest: str) -> str:
+    """js/htmx.min.js -> js/htmx.min.<digest>.js"""
+    stem, dot, ext = filename.rpartition(".")
+    if not dot:
+        return f"{filename}.{digest}"
+    return f"{stem}.{digest}.{ext}"
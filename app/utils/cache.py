@@ -0,0 +1,61 @@
+import threading
+import time
+
+from app.metrics import CACHE_LOOKUPS
+
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry. Each worker process has
+    its own copy, so the TTL bounds how stale other workers can get after
+    an invalidation. Named caches report hits and misses to /metrics.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024, name: str = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.name = name
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._data[key]
+                entry = None
+        if self.name:
+            CACHE_LOOKUPS.labels(self.name, "miss" if entry is None else "hit").inc()
+        return default if entry is None else entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.maxsize and key not in self._data:
+                self._evict()
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_set(self, key, factory):
+        """Return the cached value, calling factory() on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self):
+        """Drop expired entries, or the one closest to expiry if none."""
+        now = time.monotonic()
+        expired = [k for k, (exp, _) in self._data.items() if exp < now]
+        for k in expired:
+            del self._data[k]
+        if not expired and self._data:
+            oldest = min(self._data, key=lambda k: self._data[k][0])
+            del self._data[oldest]
@@ -0,0 +1,96 @@
+"""
+gzip/brotli for dynamic responses, including streamed ones. Brotli is
+optional - without the package only gzip is offered.
+"""
+import gzip
+import zlib
+
+from flask import request
+
+from app.constants import COMPRESS_MIN_SIZE, COMPRESS_MIMETYPES
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+def available_encodings() -> tuple:
+    """Encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli else ("gzip",)
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compress data; best=True for one-off work like static assets."""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else 5)
+    return gzip.compress(data, compresslevel=9 if best else 6)
+
+
+def preferred_encoding(encodings) -> str:
+    """The client's best accepted encoding of encodings, or "identity"."""
+    accepted = request.accept_encodings
+    for encoding in encodings:
+        if accepted[encoding]:
+            return encoding
+    return "identity"
+
+
+def init_compression(app):
+    # after_request hooks run in reverse order - registered first, this
+    # one sees the final body
+    app.after_request(_compress_response)
+
+
+def _compress_response(response):
+    # Files and already encoded responses pass through
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESS_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if response.is_streamed:
+        encoding = preferred_encoding(available_encodings())
+        if encoding != "identity":
+            response.response = _compress_stream(response.response, encoding)
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+    if (response.content_length or 0) < COMPRESS_MIN_SIZE:
+        return response
+    encoding = preferred_encoding(available_encodings())
+    if encoding == "identity":
+        return response
+
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers["Content-Encoding"] = encoding
+    # The ETag named the uncompressed bytes
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+
+def _compress_stream(body, encoding):
+    # Each chunk is flushed so the browser can render it on arrival
+    chunks = (c.encode() if isinstance(c, str) else c for c in body)
+    try:
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=5)
+            for chunk in chunks:
+                yield compressor.process(chunk) + compressor.flush()
+            yield compressor.finish()
+        else:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            for chunk in chunks:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield compressor.flush()
+    finally:
+        # Ends the wrapped stream's request context on early disconnects
+        if hasattr(body, "close"):
+            body.close()
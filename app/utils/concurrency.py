@@ -0,0 +1,64 @@
+"""Optimistic concurrency helpers for edit forms (see version_id columns)."""
+from datetime import datetime
+
+from flask import request
+from sqlalchemy.orm.attributes import flag_modified
+
+
+VERSION_FIELD = "version_id"
+
+
+def submitted_version():
+    """Version the edit form was rendered with; None for pages without one."""
+    return request.form.get(VERSION_FIELD, type=int)
+
+
+def is_stale(obj) -> bool:
+    """True if the row changed since the submitted form was rendered."""
+    version = submitted_version()
+    return version is not None and version != obj.version_id
+
+
+def bump_version(obj, attr: str):
+    """
+    Force an UPDATE of obj so its version counter moves even when only
+    child rows changed. attr is any column attribute of obj.
+    """
+    flag_modified(obj, attr)
+
+
+def edit_conflicts(form, current: dict) -> list:
+    """
+    Fields whose submitted value differs from the current row, as
+    [{"name", "label", "theirs", "yours", "input"}]. current maps form
+    field names to the values stored now, already in form representation;
+    "input" is theirs as an <input> value, for taking it over in the form.
+    """
+    conflicts = []
+    for name, theirs in current.items():
+        field = form[name]
+        yours = field.data
+        if _normalize(yours) != _normalize(theirs):
+            conflicts.append({
+                "name": name,
+                "label": field.label.text,
+                "theirs": theirs,
+                "yours": yours,
+                "input": _input_value(theirs),
+            })
+    return conflicts
+
+
+def _normalize(value):
+    # Empty textareas submit "" where the row holds NULL
+    return None if value == "" else value
+
+
+def _input_value(value) -> str:
+    if value is None or value is False:
+        return ""
+    if value is True:
+        return "y"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%dT%H:%M")
+    return str(value)
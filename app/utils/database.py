@@ -28,3 +28,36 @@ def generate_client_public_id():
 def generate_session_public_id():
     from app.models import Session
     return _generate_unique(Session, PUBLIC_ID_SIZE_SESSION)
+
+
+def generate_client_public_ids(count: int) -> list:
+    """Allocate `count` unique client public IDs (see _generate_unique_many)."""
+    from app.models import Client
+    return _generate_unique_many(Client, PUBLIC_ID_SIZE_CLIENT, count)
+
+
+def generate_session_public_ids(count: int) -> list:
+    """Allocate `count` unique session public IDs (see _generate_unique_many)."""
+    from app.models import Session
+    return _generate_unique_many(Session, PUBLIC_ID_SIZE_SESSION, count)
+
+
+def _generate_unique_many(model, size, count):
+    """
+    Allocate `count` unique public IDs with one lookup per round,
+    instead of one query per ID as the column default does.
+    """
+    from app import db
+    ids = set()
+    for _ in range(MAX_PUBLIC_ID_RETRIES):
+        candidates = {
+            generate(size=size)
+            for _ in range(count - len(ids))
+        } - ids
+        taken = set(db.session.execute(
+            select(model.public_id).where(model.public_id.in_(candidates))
+        ).scalars())
+        ids |= candidates - taken
+        if len(ids) == count:
+            return list(ids)
+    raise ValueError("Failed to generate public IDs.")
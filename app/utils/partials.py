@@ -0,0 +1,42 @@
+"""
+Content-only rendering for boosted HTMX navigation. Pages that extend
+`base_layout` send just their content block when a boosted nav link
+asks for them; everything else renders the full layout.
+"""
+from flask import request
+
+
+def is_boosted() -> bool:
+    """A boosted link click - not a history restore, which needs the full page."""
+    return (
+        "HX-Boosted" in request.headers
+        and "HX-History-Restore-Request" not in request.headers
+    )
+
+
+def init_partials(app):
+    app.context_processor(_base_layout)
+    app.after_request(_partial_headers)
+
+
+def _base_layout():
+    return {"base_layout": "partial.html" if is_boosted() else "layout.html"}
+
+
+def _partial_headers(response):
+    if response.mimetype != "text/html":
+        return response
+    # The same URL answers with a full page or a fragment
+    response.vary.add("HX-Request")
+    response.vary.add("HX-Boosted")
+    # A boosted click that ended on a full document (login redirect, a page
+    # without a partial) would nest a whole layout in #page - reload instead.
+    # Streamed bodies are left unread.
+    if (
+        is_boosted()
+        and not response.is_streamed
+        and response.status_code == 200
+        and response.get_data()[:15].lower().startswith(b"<!doctype")
+    ):
+        response.headers["HX-Redirect"] = request.url
+    return response
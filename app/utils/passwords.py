@@ -0,0 +1,68 @@
+"""
+Password hashing off the request thread.
+
+Hashes run in a small per-process thread pool of PASSWORD_HASH_WORKERS.
+hashlib's scrypt and pbkdf2 release the GIL, so with threaded workers the
+other requests keep being served during a login burst, while the pool
+caps how many CPU- and memory-hungry hashes run at once.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(Exception):
+    """The pool did not get to the hash within PASSWORD_HASH_TIMEOUT."""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def hash_password(password: str) -> str:
+    config = current_app.config
+    return _run(
+        generate_password_hash,
+        password,
+        method=config["PASSWORD_HASH_METHOD"],
+        salt_length=config["PASSWORD_HASH_SALT_LENGTH"],
+    )
+
+
+def verify_password(pw_hash: str, password: str) -> bool:
+    return _run(check_password_hash, pw_hash, password)
+
+
+def needs_rehash(pw_hash: str) -> bool:
+    """True if pw_hash was made with other parameters than configured now."""
+    method, _, rest = pw_hash.partition("$")
+    salt = rest.partition("$")[0]
+    config = current_app.config
+    return (
+        method != config["PASSWORD_HASH_METHOD"]
+        or len(salt) != config["PASSWORD_HASH_SALT_LENGTH"]
+    )
+
+
+def _run(fn, *args, **kwargs):
+    future = _get_executor().submit(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=current_app.config["PASSWORD_HASH_TIMEOUT"])
+    except TimeoutError:
+        future.cancel()
+        raise HashingBusy()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Created lazily so each forked worker gets its own threads
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config["PASSWORD_HASH_WORKERS"],
+                    thread_name_prefix="password-hash"
+                )
+    return _executor
@@ -0,0 +1,11 @@
+from datetime import datetime
+from decimal import Decimal
+
+
+def json_value(value):
+    """Column value as JSON: ISO 8601 datetimes and numeric Decimals."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
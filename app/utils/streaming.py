@@ -0,0 +1,56 @@
+"""
+Streamed rendering for long list pages. Rows come from a server-side
+cursor and the template is sent as it renders, so the first bytes leave
+before the last row is fetched and memory does not grow with the list.
+"""
+from itertools import chain
+
+from flask import Response, get_flashed_messages, stream_template
+from flask_wtf.csrf import generate_csrf
+
+from app.constants import STREAM_CHUNK_SIZE, STREAM_YIELD_PER
+
+
+def stream_rows(stmt, size: int = STREAM_YIELD_PER):
+    """
+    Execute stmt with a server-side cursor fetching `size` rows at a time.
+    Returns (first_row, rows): first_row is None for an empty result and
+    rows still yields it, so pages can show totals or an empty state
+    before the list starts.
+    """
+    from app import db
+    result = db.session.execute(stmt.execution_options(yield_per=size))
+    first = next(result, None)
+    if first is None:
+        return None, iter(())
+    return first, chain((first,), result)
+
+
+def stream_page(template_name: str, **context) -> Response:
+    """Render a template as a streamed HTML response."""
+    # The session cookie goes out with the headers, before the body renders,
+    # so session writes the layout would make happen now: flashes are popped
+    # (the template gets them from the request's cache) and the CSRF token
+    # is created
+    get_flashed_messages(with_categories=True)
+    generate_csrf()
+    return Response(
+        _buffered(stream_template(template_name, **context)),
+        mimetype="text/html"
+    )
+
+
+def _buffered(chunks, size: int = STREAM_CHUNK_SIZE):
+    # Jinja yields tiny fragments - send them in reasonably sized writes
+    buffer, buffered = [], 0
+    try:
+        for chunk in chunks:
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= size:
+                yield "".join(buffer)
+                buffer, buffered = [], 0
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        chunks.close()
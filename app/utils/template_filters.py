@@ -1,8 +1,11 @@
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
+from flask_login import current_user
 
-def dt_no_seconds(value, format="%d.%m %H:%M"):
+
+def dt_no_seconds(value, format="%d.%m %H:%M", tz_name=None):
+    """Format a UTC datetime in tz_name, by default the trainer's timezone."""
     if value is None:
         return ""
     if not isinstance(value, datetime):
@@ -10,10 +13,27 @@ def dt_no_seconds(value, format="%d.%m %H:%M"):
 
     if value.tzinfo is None:
         value = value.replace(tzinfo=timezone.utc)
-    local_dt = value.astimezone(ZoneInfo("Europe/Kyiv"))
+    local_dt = value.astimezone(ZoneInfo(tz_name or _trainer_tz()))
 
     return local_dt.strftime(format)
 
 
+def edit_value(value):
+    """Form values in edit conflicts; datetimes there are already local."""
+    if value is None or value == "":
+        return "—"
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, datetime):
+        return value.strftime("%d.%m.%Y %H:%M")
+    return value
+
+
+def _trainer_tz() -> str:
+    # Anonymous users have no timezone attribute
+    return getattr(current_user, "timezone", None) or "Europe/Kyiv"
+
+
 def init_template_filters(app):
     app.jinja_env.filters["dt_no_seconds"] = dt_no_seconds
+    app.jinja_env.filters["edit_value"] = edit_value
@@ -0,0 +1,96 @@
+"""
+Per-worker warm-up. Gunicorn runs warm_up() in each worker before it
+accepts requests (see gunicorn.conf.py), so the first users after a
+deploy don't pay for template compilation, timezone loading or opening
+database connections.
+"""
+import time
+from contextlib import contextmanager
+from zoneinfo import ZoneInfo
+
+from jinja2 import FileSystemBytecodeCache
+from sqlalchemy import select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models import Trainer
+
+DEFAULT_TIMEZONE = "Europe/Kyiv"
+
+
+def init_template_cache(app):
+    """
+    Persist compiled templates as bytecode, shared by all workers and
+    reused across restarts. TEMPLATE_CACHE_DIR unset means Jinja's
+    per-user temp directory.
+    """
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+        app.config.get("TEMPLATE_CACHE_DIR")
+    )
+
+
+@contextmanager
+def timed(timings: dict, label: str):
+    """Record the duration of the block in milliseconds under label."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[label] = (time.perf_counter() - started) * 1000
+
+
+def warm_up(app) -> dict:
+    """
+    Compile every template, open pool connections and load the timezones
+    trainers use. Returns {step: milliseconds}. A database that is not
+    reachable yet is logged, not raised - the worker still starts.
+    """
+    timings = {}
+    with app.app_context():
+        with timed(timings, "templates"):
+            count = _compile_templates(app)
+        app.logger.debug("Compiled %d templates", count)
+
+        try:
+            with timed(timings, "pool"):
+                _open_connections(app.config["WARMUP_POOL_CONNECTIONS"])
+            with timed(timings, "timezones"):
+                _load_timezones()
+        except SQLAlchemyError as exc:
+            app.logger.warning("Warm-up skipped the database: %s", exc)
+        finally:
+            db.session.remove()
+    return timings
+
+
+def _compile_templates(app) -> int:
+    env = app.jinja_env
+    names = env.list_templates(extensions=("html",))
+    for name in names:
+        env.get_template(name)
+    return len(names)
+
+
+def _open_connections(count: int):
+    # Held together so the pool really grows to `count` connections
+    connections = []
+    try:
+        for _ in range(count):
+            connection = db.engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def _load_timezones():
+    # ZoneInfo caches by key, so later lookups skip the tzdata read
+    names = db.session.scalars(
+        select(Trainer.timezone).where(Trainer.timezone.isnot(None)).distinct()
+    ).all()
+    for name in {DEFAULT_TIMEZONE, *names}:
+        try:
+            ZoneInfo(name)
+        except (ValueError, LookupError):
+            continue
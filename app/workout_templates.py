@@ -0,0 +1,108 @@
+"""Workout templates: saving sessions as templates and applying them."""
+from sqlalchemy import func, insert, literal, select
+
+from app import db
+from app.models import (
+    Session, SessionExercise, SessionTag,
+    WorkoutTemplate, WorkoutTemplateExercise, WorkoutTemplateTag,
+)
+
+
+def trainer_templates(trainer_id: int) -> list:
+    """(id, name, exercise_count) rows of a trainer's templates."""
+    return db.session.execute(
+        select(
+            WorkoutTemplate.id,
+            WorkoutTemplate.name,
+            func.count(WorkoutTemplateExercise.id).label("exercise_count"),
+        )
+        .outerjoin(
+            WorkoutTemplateExercise,
+            WorkoutTemplateExercise.template_id == WorkoutTemplate.id
+        )
+        .where(WorkoutTemplate.trainer_id == trainer_id)
+        .group_by(WorkoutTemplate.id)
+        .order_by(WorkoutTemplate.name)
+    ).all()
+
+
+def create_template_from_session(session_obj: Session, trainer_id: int,
+                                 name: str) -> WorkoutTemplate:
+    """Copy a session's exercises and tags into a new template, server-side."""
+    template = WorkoutTemplate(
+        trainer_id=trainer_id,
+        name=name,
+        duration_min=session_obj.duration_min,
+        notes=session_obj.notes,
+    )
+    db.session.add(template)
+    db.session.flush()
+
+    se = SessionExercise
+    db.session.execute(
+        insert(WorkoutTemplateExercise).from_select(
+            ["template_id", "exercise_id", "position",
+             "sets", "reps", "time_seconds", "weight"],
+            select(
+                literal(template.id),
+                se.exercise_id,
+                func.row_number().over(order_by=se.id),
+                se.sets,
+                se.reps,
+                se.time_seconds,
+                se.weight,
+            ).where(se.session_id == session_obj.id)
+        )
+    )
+    db.session.execute(
+        insert(WorkoutTemplateTag).from_select(
+            ["template_id", "tag_id"],
+            select(literal(template.id), SessionTag.tag_id)
+            .where(SessionTag.session_id == session_obj.id)
+        )
+    )
+    return template
+
+
+def apply_template(template: WorkoutTemplate, client, start_dt) -> Session:
+    """
+    Create a planned session for a client from a template. Exercise and
+    tag rows are copied with INSERT ... SELECT, never loaded into Python.
+    """
+    session_obj = Session(
+        client_id=client.id,
+        start_dt=start_dt,
+        duration_min=template.duration_min,
+        price=client.price,
+        notes=template.notes,
+    )
+    db.session.add(session_obj)
+    db.session.flush()
+
+    te = WorkoutTemplateExercise
+    db.session.execute(
+        insert(SessionExercise).from_select(
+            ["session_id", "client_id", "exercise_id",
+             "sets", "reps", "time_seconds", "weight"],
+            select(
+                literal(session_obj.id),
+                literal(client.id),
+                te.exercise_id,
+                te.sets,
+                te.reps,
+                te.time_seconds,
+                te.weight,
+            )
+            .where(te.template_id == template.id)
+            # Serial ids follow insert order, which is the display order
+            .order_by(te.position)
+        )
+    )
+    db.session.execute(
+        insert(SessionTag).from_select(
+            ["session_id", "tag_id"],
+            select(literal(session_obj.id), WorkoutTemplateTag.tag_id)
+            .where(WorkoutTemplateTag.template_id == template.id)
+        )
+    )
+    return session_obj
@@ -0,0 +1,102 @@
+"""
+Cold start: time from launching a fresh worker process to its first
+response, with and without the warm-up in app/warmup.py.
+
+Each run is a new interpreter, like a gunicorn worker after a deploy:
+
+    cold     empty template bytecode cache, no warm-up
+    cached   bytecode cache filled by an earlier run, no warm-up
+    warmed   cached, and warm_up() runs before the first request
+
+    python benchmarks/cold_start.py --runs 5 --path /login
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STEPS = ("import", "create_app", "warm_up", "first", "second", "to_first")
+
+
+def child(path, warm):
+    """One worker lifetime; prints its timings as JSON."""
+    started = time.perf_counter()
+    sys.path.insert(0, str(ROOT))
+    from app import create_app
+
+    imported = time.perf_counter()
+    app = create_app()
+    created = time.perf_counter()
+    if warm:
+        from app.warmup import warm_up
+        warm_up(app)
+    warmed = time.perf_counter()
+
+    client = app.test_client()
+    status = client.get(path).status_code
+    first = time.perf_counter()
+    client.get(path)
+    second = time.perf_counter()
+
+    print(json.dumps({
+        "status": status,
+        "first_response_at": time.time() - (second - first),
+        "import": (imported - started) * 1000,
+        "create_app": (created - imported) * 1000,
+        "warm_up": (warmed - created) * 1000,
+        "first": (first - warmed) * 1000,
+        "second": (second - first) * 1000,
+    }))
+
+
+def spawn(path, warm, cache_dir):
+    env = dict(os.environ, TEMPLATE_CACHE_DIR=cache_dir)
+    args = [sys.executable, __file__, "--child", "--path", path]
+    if warm:
+        args.append("--warm")
+    launched = time.time()
+    out = subprocess.run(args, env=env, capture_output=True, text=True, check=True)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["to_first"] = (result["first_response_at"] - launched) * 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/login", help="URL of the first request")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.path, args.warm)
+        return
+
+    print(f"{args.runs} runs, first request GET {args.path}, medians in ms")
+    print(f"{'':<8}" + "".join(f"{step:>12}" for step in STEPS))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scenarios = {"cold": [], "cached": [], "warmed": []}
+        for _ in range(args.runs):
+            # A fresh cache per cold run; the cached runs reuse the last one
+            with tempfile.TemporaryDirectory() as empty_dir:
+                scenarios["cold"].append(spawn(args.path, False, empty_dir))
+            spawn(args.path, False, cache_dir)
+            scenarios["cached"].append(spawn(args.path, False, cache_dir))
+            scenarios["warmed"].append(spawn(args.path, True, cache_dir))
+
+        for name, results in scenarios.items():
+            medians = [statistics.median(r[step] for r in results) for step in STEPS]
+            print(f"{name:<8}" + "".join(f"{ms:12.1f}" for ms in medians))
+        statuses = {r["status"] for results in scenarios.values() for r in results}
+        print(f"first response status: {', '.join(map(str, sorted(statuses)))}")
+
+
+if __name__ == "__main__":
+    main()
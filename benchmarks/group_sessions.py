@@ -0,0 +1,148 @@
+"""
+Group session write path: N x add_session() vs one bulk group write.
+
+Runs against the configured database inside transactions that are always
+rolled back, so it is safe on a dev database:
+
+    python benchmarks/group_sessions.py --clients 20 --exercises 6 --runs 20
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask_login import login_user  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.forms import GroupSessionForm  # noqa: E402
+from app.models import (  # noqa: E402
+    Client, Exercise, Session, SessionExercise, SessionTag, Tag, Trainer,
+)
+from app.routes.sessions import _create_group_sessions  # noqa: E402
+
+
+def seed(n_clients, n_exercises):
+    trainer = Trainer(
+        name="bench", email=f"bench-{time.time_ns()}@example.com",
+        password_hash="x"
+    )
+    db.session.add(trainer)
+    db.session.flush()
+    clients = [
+        Client(trainer_id=trainer.id, name=f"Client {i}", price=500)
+        for i in range(n_clients)
+    ]
+    exercises = [
+        Exercise(trainer_id=trainer.id, name=f"Exercise {i}")
+        for i in range(n_exercises)
+    ]
+    tags = [Tag(trainer_id=trainer.id, name=f"tag{i}") for i in range(2)]
+    db.session.add_all(clients + exercises + tags)
+    db.session.flush()
+    return trainer, clients, exercises, tags
+
+
+def form_data(clients, exercises, tags, start):
+    data = {
+        "clients": [c.id for c in clients],
+        "start_dt": start.strftime("%Y-%m-%dT%H:%M"),
+        "duration_min": "60",
+        "tags": [t.id for t in tags],
+    }
+    for i, ex in enumerate(exercises):
+        data[f"exercises-{i}-exercise"] = str(ex.id)
+        data[f"exercises-{i}-sets"] = "3"
+        data[f"exercises-{i}-reps"] = "10"
+        data[f"exercises-{i}-weight"] = "40"
+    # Overrides for half of the group
+    for c in clients[::2]:
+        data[f"price-{c.id}"] = "400"
+        data[f"weight-{c.id}-{exercises[0].id}"] = "50"
+    return data
+
+
+def per_session_write(clients, exercises, tags, start):
+    """What entering the group through add_session() N times costs."""
+    for client in clients:
+        s = Session(
+            client_id=client.id, start_dt=start,
+            duration_min=60, price=client.price
+        )
+        db.session.add(s)
+        db.session.flush()
+        for ex in exercises:
+            db.session.add(SessionExercise(
+                session_id=s.id, client_id=client.id, exercise_id=ex.id,
+                sets=3, reps=10, weight=40
+            ))
+        for tag in tags:
+            db.session.add(SessionTag(session_id=s.id, tag_id=tag.id))
+        db.session.flush()
+
+
+def run(label, fn, runs, statements):
+    timings = []
+    for _ in range(runs):
+        nested = db.session.begin_nested()
+        statements[0] = 0
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+        nested.rollback()
+    print(
+        f"{label:<22} median {statistics.median(timings):7.2f} ms   "
+        f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:7.2f} ms   "
+        f"statements {statements[0]}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--exercises", type=int, default=6)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config["WTF_CSRF_ENABLED"] = False
+
+    with app.app_context():
+        statements = [0]
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def count(*_):
+            statements[0] += 1
+
+        try:
+            trainer, clients, exercises, tags = seed(args.clients, args.exercises)
+            start = datetime.now() + timedelta(days=30)
+            data = form_data(clients, exercises, tags, start)
+
+            with app.test_request_context("/sessions/group", method="POST", data=data):
+                login_user(trainer)
+                form = GroupSessionForm()
+                form.clients.choices = [(c.id, c.name) for c in clients]
+                for entry in form.exercises:
+                    entry.form.exercise.choices = [(str(e.id), e.name) for e in exercises]
+                if not form.validate():
+                    sys.exit(f"Form did not validate: {form.errors}")
+                by_id = {c.id: c for c in clients}
+
+                print(f"{args.clients} clients x {args.exercises} exercises, {args.runs} runs")
+                run("add_session() x N", lambda: per_session_write(
+                    clients, exercises, tags, start
+                ), args.runs, statements)
+                run("bulk group write", lambda: _create_group_sessions(
+                    form, by_id
+                ), args.runs, statements)
+        finally:
+            db.session.rollback()
+
+
+if __name__ == "__main__":
+    main()
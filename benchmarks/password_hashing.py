@@ -0,0 +1,67 @@
+"""
+Login hashing throughput: password checks per second in one worker.
+
+Simulates a burst of concurrent logins hitting one gthread worker and
+reports checks/sec for each hashing method, inline on the request threads
+and through the bounded pool in app/utils/passwords.py:
+
+    python benchmarks/password_hashing.py --threads 4 --logins 40 \\
+        --method scrypt:32768:8:1 --method pbkdf2:sha256:600000
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from werkzeug.security import check_password_hash, generate_password_hash  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.utils import verify_password  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+
+
+def burst(app, check, pw_hash, threads, logins):
+    """Run `logins` checks from `threads` request threads; returns checks/sec."""
+    def login():
+        with app.app_context():
+            assert check(pw_hash, PASSWORD)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as request_threads:
+        for future in [request_threads.submit(login) for _ in range(logins)]:
+            future.result()
+    return logins / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=4, help="request threads per worker")
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--method", action="append", help="werkzeug hash method")
+    args = parser.parse_args()
+
+    app = create_app()
+    methods = args.method or [app.config["PASSWORD_HASH_METHOD"]]
+    pool = app.config["PASSWORD_HASH_WORKERS"]
+
+    print(f"{args.threads} request threads, {args.logins} logins, hash pool of {pool}")
+    for method in methods:
+        pw_hash = generate_password_hash(PASSWORD, method=method)
+        single = time.perf_counter()
+        check_password_hash(pw_hash, PASSWORD)
+        single = (time.perf_counter() - single) * 1000
+
+        inline = burst(app, check_password_hash, pw_hash, args.threads, args.logins)
+        pooled = burst(app, verify_password, pw_hash, args.threads, args.logins)
+        print(
+            f"{method:<24} one check {single:7.1f} ms   "
+            f"inline {inline:6.1f}/s   pooled {pooled:6.1f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Gunicorn settings. Each worker imports the app and runs app/warmup.py
+before it is handed requests; the timings are logged per worker.
+Workers share Prometheus samples through PROMETHEUS_MULTIPROC_DIR (see
+app/metrics.py).
+"""
+import os
+import shutil
+import tempfile
+import time
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+# Must be set before workers import prometheus_client
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "trainerjournal-metrics"),
+)
+
+
+def on_starting(server):
+    # Samples of a previous master would be summed into this one's
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def post_fork(server, worker):
+    worker.started_at = time.perf_counter()
+
+
+def post_worker_init(worker):
+    from app.warmup import warm_up
+
+    app = worker.wsgi
+    timings = {"load app": (time.perf_counter() - worker.started_at) * 1000}
+    timings.update(app.extensions.get("startup_timings", {}))
+    timings.update(warm_up(app))
+    timings["ready"] = (time.perf_counter() - worker.started_at) * 1000
+    worker.log.info(
+        "Worker %s warmed up: %s", worker.pid,
+        ", ".join(f"{step} {ms:.0f} ms" for step, ms in timings.items())
+    )
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
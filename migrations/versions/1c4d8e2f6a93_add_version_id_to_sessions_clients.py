@@ -0,0 +1,31 @@
+"""add version_id to sessions and clients
+
+Revision ID: 1c4d8e2f6a93
+Revises: 0b9e4c2a7d15
+Create Date: 2026-10-19 19:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c4d8e2f6a93'
+down_revision: Union[str, Sequence[str], None] = '0b9e4c2a7d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant server default - no table rewrite on PostgreSQL 11+
+    op.add_column('clients', sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('sessions', sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('sessions', 'version_id')
+    op.drop_column('clients', 'version_id')
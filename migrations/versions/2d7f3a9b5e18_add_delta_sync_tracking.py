@@ -0,0 +1,122 @@
+"""add change_seq, updated_at and sync_tombstones for delta sync
+
+Revision ID: 2d7f3a9b5e18
+Revises: 1c4d8e2f6a93
+Create Date: 2026-10-19 20:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d7f3a9b5e18'
+down_revision: Union[str, Sequence[str], None] = '1c4d8e2f6a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SYNCED_TABLES = ('clients', 'sessions', 'exercises', 'session_exercises', 'tags')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('change_seq')))
+
+    for table in SYNCED_TABLES:
+        # nextval() is volatile, so this rewrites the table once and
+        # numbers the existing rows
+        op.add_column(table, sa.Column('change_seq', sa.BigInteger(), server_default=sa.text("nextval('change_seq')"), nullable=False))
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+        # clock_timestamp() from now on - now() is the transaction start
+        op.alter_column(table, 'updated_at', server_default=sa.text('clock_timestamp()'))
+
+    op.create_index('ix_clients_trainer_change_seq', 'clients', ['trainer_id', 'change_seq'], unique=False)
+    op.create_index('ix_sessions_change_seq', 'sessions', ['change_seq'], unique=False)
+    op.create_index('ix_exercises_trainer_change_seq', 'exercises', ['trainer_id', 'change_seq'], unique=False)
+    op.create_index('ix_se_change_seq', 'session_exercises', ['change_seq'], unique=False)
+    op.create_index('ix_tags_trainer_change_seq', 'tags', ['trainer_id', 'change_seq'], unique=False)
+
+    op.create_table('sync_tombstones',
+    sa.Column('seq', sa.BigInteger(), server_default=sa.text("nextval('change_seq')"), nullable=False),
+    sa.Column('trainer_id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=32), nullable=False),
+    sa.Column('row_key', sa.String(length=32), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('clock_timestamp()'), nullable=False),
+    sa.PrimaryKeyConstraint('seq')
+    )
+    op.create_index('ix_sync_tombstones_trainer_seq', 'sync_tombstones', ['trainer_id', 'seq'], unique=False)
+    op.create_index(op.f('ix_sync_tombstones_deleted_at'), 'sync_tombstones', ['deleted_at'], unique=False)
+
+    # Every UPDATE, ORM or bulk, moves the row to the head of the feed
+    op.execute("""
+        CREATE FUNCTION sync_touch() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.change_seq := nextval('change_seq');
+            NEW.updated_at := clock_timestamp();
+            RETURN NEW;
+        END $$
+    """)
+    # Rows removed by a cascade from their client find no owner and are
+    # covered by the client's own tombstone
+    op.execute("""
+        CREATE FUNCTION sync_tombstone() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            owner integer;
+            key text;
+        BEGIN
+            IF TG_TABLE_NAME IN ('clients', 'exercises', 'tags') THEN
+                owner := OLD.trainer_id;
+            ELSE
+                SELECT trainer_id INTO owner FROM clients WHERE id = OLD.client_id;
+            END IF;
+            IF TG_TABLE_NAME IN ('clients', 'sessions') THEN
+                key := OLD.public_id;
+            ELSE
+                key := OLD.id::text;
+            END IF;
+            IF owner IS NOT NULL THEN
+                INSERT INTO sync_tombstones (trainer_id, table_name, row_key)
+                VALUES (owner, TG_TABLE_NAME, key);
+            END IF;
+            RETURN OLD;
+        END $$
+    """)
+    for table in SYNCED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_sync_touch BEFORE UPDATE ON {table}
+            FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+            EXECUTE FUNCTION sync_touch()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_sync_tombstone AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_tombstone()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in SYNCED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_sync_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER {table}_sync_touch ON {table}")
+    op.execute("DROP FUNCTION sync_tombstone()")
+    op.execute("DROP FUNCTION sync_touch()")
+
+    op.drop_index(op.f('ix_sync_tombstones_deleted_at'), table_name='sync_tombstones')
+    op.drop_index('ix_sync_tombstones_trainer_seq', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+
+    op.drop_index('ix_tags_trainer_change_seq', table_name='tags')
+    op.drop_index('ix_se_change_seq', table_name='session_exercises')
+    op.drop_index('ix_exercises_trainer_change_seq', table_name='exercises')
+    op.drop_index('ix_sessions_change_seq', table_name='sessions')
+    op.drop_index('ix_clients_trainer_change_seq', table_name='clients')
+    for table in SYNCED_TABLES:
+        op.drop_column(table, 'updated_at')
+        op.drop_column(table, 'change_seq')
+
+    op.execute(sa.schema.DropSequence(sa.Sequence('change_seq')))
@@ -0,0 +1,40 @@
+"""add api_tokens
+
+Revision ID: 3e8a4b1c7d26
+Revises: 2d7f3a9b5e18
+Create Date: 2026-10-19 20:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8a4b1c7d26'
+down_revision: Union[str, Sequence[str], None] = '2d7f3a9b5e18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('api_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('trainer_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['trainer_id'], ['trainers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_hash'),
+    sa.UniqueConstraint('trainer_id', 'name', name='uq_api_token_name_per_trainer')
+    )
+    op.create_index(op.f('ix_api_tokens_trainer_id'), 'api_tokens', ['trainer_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_api_tokens_trainer_id'), table_name='api_tokens')
+    op.drop_table('api_tokens')
@@ -0,0 +1,28 @@
+"""add trainers.credential_version
+
+Revision ID: 4f1b6c8d2e37
+Revises: 3e8a4b1c7d26
+Create Date: 2026-10-19 21:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1b6c8d2e37'
+down_revision: Union[str, Sequence[str], None] = '3e8a4b1c7d26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('trainers', sa.Column('credential_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('trainers', 'credential_version')
@@ -0,0 +1,76 @@
+"""add personal_records
+
+Revision ID: 5c2d9a7e41f3
+Revises: 8e34edc52494
+Create Date: 2026-10-19 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2d9a7e41f3'
+down_revision: Union[str, Sequence[str], None] = '8e34edc52494'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (metric, value expression, rows it applies to) - mirrors app.records
+METRICS = (
+    ("weight", "se.weight", "se.reps IS NOT NULL AND se.weight > 0"),
+    (
+        "e1rm",
+        "CASE WHEN se.reps = 1 THEN se.weight ELSE se.weight * (1 + se.reps / 30.0) END",
+        "se.reps IS NOT NULL AND se.weight > 0",
+    ),
+    ("volume", "se.sets * se.reps * se.weight", "se.reps IS NOT NULL AND se.weight > 0"),
+    ("time", "se.time_seconds", "se.time_seconds IS NOT NULL"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('personal_records',
+    sa.Column('client_id', sa.Integer(), nullable=False),
+    sa.Column('exercise_id', sa.Integer(), nullable=False),
+    sa.Column('metric', sa.String(length=10), nullable=False),
+    sa.Column('value', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('achieved_at', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint(
+        "metric IN ('weight', 'e1rm', 'volume', 'time')",
+        name='ck_personal_record_metric_valid'
+    ),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('client_id', 'exercise_id', 'metric')
+    )
+    op.create_index(
+        op.f('ix_personal_records_session_id'),
+        'personal_records',
+        ['session_id'],
+        unique=False
+    )
+
+    # Backfill from existing history - earliest session wins a tie
+    for metric, value, applies in METRICS:
+        op.execute(f"""
+            INSERT INTO personal_records
+                (client_id, exercise_id, metric, value, session_id, achieved_at)
+            SELECT DISTINCT ON (se.client_id, se.exercise_id)
+                se.client_id, se.exercise_id, '{metric}', {value}, s.id, s.start_dt
+            FROM session_exercises se
+            JOIN sessions s ON s.id = se.session_id
+            WHERE s.status = 'done' AND {applies}
+            ORDER BY se.client_id, se.exercise_id, {value} DESC, s.start_dt
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_personal_records_session_id'), table_name='personal_records')
+    op.drop_table('personal_records')
@@ -0,0 +1,46 @@
+"""add request_profiles
+
+Revision ID: 5d3e7f1a9c42
+Revises: 4f1b6c8d2e37
+Create Date: 2026-10-19 22:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d3e7f1a9c42'
+down_revision: Union[str, Sequence[str], None] = '4f1b6c8d2e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('request_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('trainer_id', sa.Integer(), nullable=False),
+    sa.Column('method', sa.String(length=10), nullable=False),
+    sa.Column('path', sa.Text(), nullable=False),
+    sa.Column('endpoint', sa.String(length=100), nullable=True),
+    sa.Column('status_code', sa.Integer(), nullable=False),
+    sa.Column('duration_ms', sa.Integer(), nullable=False),
+    sa.Column('sql_ms', sa.Integer(), nullable=False),
+    sa.Column('stats', sa.LargeBinary(), nullable=False),
+    sa.Column('queries', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['trainer_id'], ['trainers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_request_profiles_trainer_id'), 'request_profiles', ['trainer_id'], unique=False)
+    op.create_index(op.f('ix_request_profiles_created_at'), 'request_profiles', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_request_profiles_created_at'), table_name='request_profiles')
+    op.drop_index(op.f('ix_request_profiles_trainer_id'), table_name='request_profiles')
+    op.drop_table('request_profiles')
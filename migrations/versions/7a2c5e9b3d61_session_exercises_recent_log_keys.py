@@ -0,0 +1,44 @@
+"""replace session_exercises.last_log_key with recent_log_keys
+
+Revision ID: 7a2c5e9b3d61
+Revises: 5d3e7f1a9c42
+Create Date: 2026-10-19 23:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2c5e9b3d61'
+down_revision: Union[str, Sequence[str], None] = '5d3e7f1a9c42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'session_exercises',
+        sa.Column(
+            'recent_log_keys',
+            postgresql.ARRAY(sa.String(length=21)),
+            server_default=sa.text("'{}'"),
+            nullable=False
+        )
+    )
+    op.execute(
+        "UPDATE session_exercises SET recent_log_keys = ARRAY[last_log_key] "
+        "WHERE last_log_key IS NOT NULL"
+    )
+    op.drop_column('session_exercises', 'last_log_key')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('session_exercises', sa.Column('last_log_key', sa.String(length=21), nullable=True))
+    op.execute("UPDATE session_exercises SET last_log_key = recent_log_keys[1]")
+    op.drop_column('session_exercises', 'recent_log_keys')
@@ -0,0 +1,32 @@
+"""add session_tags (tag_id, session_id) index
+
+Revision ID: 8e34edc52494
+Revises: ba5117437bd4
+Create Date: 2026-10-19 13:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e34edc52494'
+down_revision: Union[str, Sequence[str], None] = 'ba5117437bd4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_session_tags_tag_session',
+        'session_tags',
+        ['tag_id', 'session_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_session_tags_tag_session', table_name='session_tags')
@@ -0,0 +1,41 @@
+"""add session_range() and GiST index for overlap checks
+
+Revision ID: a41e6f0c93d7
+Revises: 5c2d9a7e41f3
+Create Date: 2026-10-19 15:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41e6f0c93d7'
+down_revision: Union[str, Sequence[str], None] = '5c2d9a7e41f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # timestamptz + interval is only STABLE in general (day/month units
+    # depend on TimeZone); with minutes only the result is fixed, so the
+    # wrapper can be IMMUTABLE and used in an index.
+    op.execute("""
+        CREATE FUNCTION session_range(start_dt timestamptz, duration_min integer)
+        RETURNS tstzrange
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT tstzrange(start_dt, start_dt + make_interval(mins => duration_min), '[)') $$
+    """)
+    op.execute("""
+        CREATE INDEX ix_sessions_time_range ON sessions
+        USING gist (session_range(start_dt, duration_min))
+        WHERE status <> 'cancelled'
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sessions_time_range', table_name='sessions')
+    op.execute("DROP FUNCTION session_range(timestamptz, integer)")
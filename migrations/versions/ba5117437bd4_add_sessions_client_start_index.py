@@ -0,0 +1,32 @@
+"""add sessions (client_id, start_dt, id) index
+
+Revision ID: ba5117437bd4
+Revises: 320a6157356b
+Create Date: 2026-10-19 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ba5117437bd4'
+down_revision: Union[str, Sequence[str], None] = '320a6157356b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_sessions_client_start',
+        'sessions',
+        ['client_id', 'start_dt', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sessions_client_start', table_name='sessions')
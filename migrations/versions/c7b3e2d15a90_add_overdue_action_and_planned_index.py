@@ -0,0 +1,47 @@
+"""add trainers.overdue_action and planned sessions index
+
+Revision ID: c7b3e2d15a90
+Revises: a41e6f0c93d7
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7b3e2d15a90'
+down_revision: Union[str, Sequence[str], None] = 'a41e6f0c93d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('trainers', sa.Column(
+        'overdue_action',
+        sa.String(length=10),
+        nullable=False,
+        server_default='none'
+    ))
+    op.create_check_constraint(
+        'ck_trainer_overdue_action_valid',
+        'trainers',
+        "overdue_action IN ('none', 'done', 'no_show', 'cancelled')"
+    )
+    op.create_index(
+        'ix_sessions_planned_start',
+        'sessions',
+        ['start_dt'],
+        unique=False,
+        postgresql_where=sa.text("status = 'planned'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sessions_planned_start', table_name='sessions')
+    op.drop_constraint('ck_trainer_overdue_action_valid', 'trainers', type_='check')
+    op.drop_column('trainers', 'overdue_action')
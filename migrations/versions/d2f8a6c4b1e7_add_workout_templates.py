@@ -0,0 +1,71 @@
+"""add workout templates
+
+Revision ID: d2f8a6c4b1e7
+Revises: c7b3e2d15a90
+Create Date: 2026-10-19 16:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8a6c4b1e7'
+down_revision: Union[str, Sequence[str], None] = 'c7b3e2d15a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('workout_templates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('trainer_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('duration_min', sa.Integer(), nullable=False, server_default='60'),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.CheckConstraint('duration_min > 0', name='ck_template_duration_positive'),
+    sa.ForeignKeyConstraint(['trainer_id'], ['trainers.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('trainer_id', 'name', name='uq_template_name_per_trainer')
+    )
+    op.create_index(op.f('ix_workout_templates_trainer_id'), 'workout_templates', ['trainer_id'], unique=False)
+    op.create_table('workout_template_exercises',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('template_id', sa.Integer(), nullable=False),
+    sa.Column('exercise_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('sets', sa.Integer(), nullable=False),
+    sa.Column('reps', sa.Integer(), nullable=True),
+    sa.Column('time_seconds', sa.Integer(), nullable=True),
+    sa.Column('weight', sa.Numeric(precision=5, scale=2), nullable=False, server_default=sa.text('0')),
+    sa.CheckConstraint('sets > 0', name='ck_template_exercise_sets_positive'),
+    sa.CheckConstraint('reps IS NULL OR reps > 0', name='ck_template_exercise_reps_positive'),
+    sa.CheckConstraint('weight >= 0', name='ck_template_exercise_weight_nonnegative'),
+    sa.CheckConstraint('time_seconds IS NULL OR time_seconds > 0', name='ck_template_exercise_time_positive'),
+    sa.CheckConstraint('num_nonnulls(reps, time_seconds) = 1', name='ck_template_exercise_one_metric_required'),
+    sa.ForeignKeyConstraint(['template_id'], ['workout_templates.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_workout_template_exercises_template_id'), 'workout_template_exercises', ['template_id'], unique=False)
+    op.create_index(op.f('ix_workout_template_exercises_exercise_id'), 'workout_template_exercises', ['exercise_id'], unique=False)
+    op.create_table('workout_template_tags',
+    sa.Column('template_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['template_id'], ['workout_templates.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('template_id', 'tag_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('workout_template_tags')
+    op.drop_index(op.f('ix_workout_template_exercises_exercise_id'), table_name='workout_template_exercises')
+    op.drop_index(op.f('ix_workout_template_exercises_template_id'), table_name='workout_template_exercises')
+    op.drop_table('workout_template_exercises')
+    op.drop_index(op.f('ix_workout_templates_trainer_id'), table_name='workout_templates')
+    op.drop_table('workout_templates')
@@ -0,0 +1,30 @@
+"""add sessions.group_id
+
+Revision ID: e5a1c9d7f302
+Revises: d2f8a6c4b1e7
+Create Date: 2026-10-19 17:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c9d7f302'
+down_revision: Union[str, Sequence[str], None] = 'd2f8a6c4b1e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sessions', sa.Column('group_id', sa.String(length=8), nullable=True))
+    op.create_index(op.f('ix_sessions_group_id'), 'sessions', ['group_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sessions_group_id'), table_name='sessions')
+    op.drop_column('sessions', 'group_id')
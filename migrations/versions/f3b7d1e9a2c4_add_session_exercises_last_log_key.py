@@ -0,0 +1,28 @@
+"""add session_exercises.last_log_key
+
+Revision ID: f3b7d1e9a2c4
+Revises: e5a1c9d7f302
+Create Date: 2026-10-19 18:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7d1e9a2c4'
+down_revision: Union[str, Sequence[str], None] = 'e5a1c9d7f302'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('session_exercises', sa.Column('last_log_key', sa.String(length=21), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('session_exercises', 'last_log_key')
@@ -0,0 +1,16 @@
+"""Streamed list pages (app/utils/streaming.py)."""
+
+
+def test_streamed_page_consumes_flashes(login):
+    client = login()
+    with client.session_transaction() as session:
+        session["_flashes"] = [("success", "Session added")]
+
+    first = client.get("/sessions")
+    assert first.status_code == 200
+    assert "Session added" in first.get_data(as_text=True)
+
+    # The popped flash must not come back from the session cookie
+    second = client.get("/sessions")
+    assert second.status_code == 200
+    assert "Session added" not in second.get_data(as_text=True)